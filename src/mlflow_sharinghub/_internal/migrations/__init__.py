@@ -0,0 +1,21 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Projects tables migrations package (private).
+
+Alembic migrations of the plugin tables, versioned in their own version
+table, next to the MLflow tables.
+"""
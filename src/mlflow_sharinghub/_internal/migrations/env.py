@@ -0,0 +1,41 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Alembic environment of the projects tables migrations.
+
+Run by `mlflow_sharinghub._internal.projects_table.upgrade`, on the
+connection it provides.
+"""
+
+from alembic import context
+
+from mlflow_sharinghub._internal.projects_table import VERSION_TABLE, metadata
+
+
+def _include_name(name: str | None, type_: str, _parent_names: dict) -> bool:
+    """Leave the MLflow tables out of autogenerated revisions."""
+    return type_ != "table" or name in metadata.tables
+
+
+context.configure(
+    connection=context.config.attributes["connection"],
+    target_metadata=metadata,
+    version_table=VERSION_TABLE,
+    include_name=_include_name,
+    render_as_batch=True,
+)
+with context.begin_transaction():
+    context.run_migrations()
@@ -0,0 +1,77 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Create projects tables.
+
+Revision ID: 5d1c2e8f4a37
+Revises:
+Create Date: 2024-07-01 10:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "5d1c2e8f4a37"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+_PROJECT_PATH_MAX_LENGTH = 500
+
+
+def upgrade() -> None:
+    """Create the projects tables, and the table of their backfills."""
+    # the projects tables were created without revision before the migrations
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "sharinghub_experiments_projects" not in existing_tables:
+        op.create_table(
+            "sharinghub_experiments_projects",
+            sa.Column("experiment_id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(256), nullable=False),
+            sa.Column(
+                "project_path", sa.String(_PROJECT_PATH_MAX_LENGTH), nullable=False
+            ),
+        )
+        op.create_index(
+            "ix_sharinghub_experiments_projects_project_path",
+            "sharinghub_experiments_projects",
+            ["project_path"],
+        )
+    if "sharinghub_registered_models_projects" not in existing_tables:
+        op.create_table(
+            "sharinghub_registered_models_projects",
+            sa.Column("name", sa.String(256), primary_key=True),
+            sa.Column(
+                "project_path", sa.String(_PROJECT_PATH_MAX_LENGTH), nullable=False
+            ),
+        )
+        op.create_index(
+            "ix_sharinghub_registered_models_projects_project_path",
+            "sharinghub_registered_models_projects",
+            ["project_path"],
+        )
+    op.create_table(
+        "sharinghub_projects_backfills",
+        sa.Column("table_name", sa.String(64), primary_key=True),
+        sa.Column("backfill_time", sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Drop the projects tables."""
+    op.drop_table("sharinghub_projects_backfills")
+    op.drop_table("sharinghub_registered_models_projects")
+    op.drop_table("sharinghub_experiments_projects")
@@ -0,0 +1,245 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Internal projects table module (private).
+
+Plugin-owned tables mapping experiments and registered models to their
+project path, indexed on the project path. MLflow tags tables are not
+indexed on the tag value, these tables make project-scoped queries cheap.
+
+The tables schema is versioned with alembic migrations (see migrations),
+and a table is only complete once backfilled from the entities tags.
+"""
+
+import time
+from collections.abc import Sequence
+
+from mlflow.store.model_registry.dbmodels.models import SqlRegisteredModelTag
+from mlflow.store.tracking.dbmodels.models import SqlExperiment, SqlExperimentTag
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    delete,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+# Own version table, the MLflow tables are versioned in "alembic_version"
+VERSION_TABLE = "sharinghub_alembic_version"
+
+_MIGRATIONS_LOCATION = "mlflow_sharinghub._internal:migrations"
+_PROJECT_PATH_MAX_LENGTH = 500
+
+metadata = MetaData()
+
+experiments_projects = Table(
+    "sharinghub_experiments_projects",
+    metadata,
+    Column("experiment_id", Integer, primary_key=True),
+    Column("name", String(256), nullable=False),
+    Column(
+        "project_path", String(_PROJECT_PATH_MAX_LENGTH), nullable=False, index=True
+    ),
+)
+
+registered_models_projects = Table(
+    "sharinghub_registered_models_projects",
+    metadata,
+    Column("name", String(256), primary_key=True),
+    Column(
+        "project_path", String(_PROJECT_PATH_MAX_LENGTH), nullable=False, index=True
+    ),
+)
+
+
+# Completed backfills: table name -> backfill time
+projects_backfills = Table(
+    "sharinghub_projects_backfills",
+    metadata,
+    Column("table_name", String(64), primary_key=True),
+    Column("backfill_time", BigInteger, nullable=False),
+)
+
+
+def upgrade(engine: Engine) -> None:
+    """Upgrade the tables schema to the latest revision."""
+    # alembic adds significant import time, imported lazily like MLflow does
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", _MIGRATIONS_LOCATION)
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "heads")
+
+
+def is_backfilled(conn: Connection | Session, table: Table) -> bool:
+    """Assert if the table was backfilled, and not dropped out of sync since."""
+    return (
+        conn.execute(
+            select(projects_backfills.c.table_name).where(
+                projects_backfills.c.table_name == table.name
+            )
+        ).first()
+        is not None
+    )
+
+
+def clear_backfilled(engine: Engine, table: Table) -> None:
+    """Drop the backfill of the table, out of sync, until backfilled again."""
+    with engine.begin() as conn:
+        conn.execute(
+            delete(projects_backfills).where(
+                projects_backfills.c.table_name == table.name
+            )
+        )
+
+
+def _set_backfilled(conn: Connection, table: Table) -> None:
+    conn.execute(
+        delete(projects_backfills).where(projects_backfills.c.table_name == table.name)
+    )
+    conn.execute(
+        insert(projects_backfills).values(
+            table_name=table.name, backfill_time=int(time.time() * 1000)
+        )
+    )
+
+
+def select_experiments_ids(project_paths: Sequence[str]) -> Select:
+    """Select the ids of the experiments of the given projects."""
+    return select(experiments_projects.c.experiment_id).where(
+        experiments_projects.c.project_path.in_(project_paths)
+    )
+
+
+def select_registered_models_names(project_paths: Sequence[str]) -> Select:
+    """Select the names of the registered models of the given projects."""
+    return select(registered_models_projects.c.name).where(
+        registered_models_projects.c.project_path.in_(project_paths)
+    )
+
+
+def save_experiment(
+    engine: Engine, experiment_id: str, name: str, project_path: str
+) -> None:
+    """Insert or replace the experiment mapping."""
+    with engine.begin() as conn:
+        conn.execute(
+            delete(experiments_projects).where(
+                experiments_projects.c.experiment_id == int(experiment_id)
+            )
+        )
+        if project_path:
+            conn.execute(
+                insert(experiments_projects).values(
+                    experiment_id=int(experiment_id),
+                    name=name,
+                    project_path=project_path,
+                )
+            )
+
+
+def save_registered_model(
+    engine: Engine, name: str, project_path: str, old_name: str | None = None
+) -> None:
+    """Insert or replace the registered model mapping, renamed from old_name."""
+    with engine.begin() as conn:
+        conn.execute(
+            delete(registered_models_projects).where(
+                registered_models_projects.c.name.in_({name, old_name or name})
+            )
+        )
+        if project_path:
+            conn.execute(
+                insert(registered_models_projects).values(
+                    name=name, project_path=project_path
+                )
+            )
+
+
+def delete_registered_model(engine: Engine, name: str) -> None:
+    """Delete the registered model mapping."""
+    with engine.begin() as conn:
+        conn.execute(
+            delete(registered_models_projects).where(
+                registered_models_projects.c.name == name
+            )
+        )
+
+
+def backfill_experiments(engine: Engine, project_tag: str) -> int:
+    """Rebuild the experiments mapping from the experiments project tags.
+
+    Returns:
+        The number of experiments mapped.
+    """
+    with engine.begin() as conn:
+        conn.execute(delete(experiments_projects))
+        conn.execute(
+            insert(experiments_projects).from_select(
+                ["experiment_id", "name", "project_path"],
+                select(
+                    SqlExperiment.experiment_id,
+                    SqlExperiment.name,
+                    SqlExperimentTag.value,
+                )
+                .join(
+                    SqlExperimentTag,
+                    SqlExperimentTag.experiment_id == SqlExperiment.experiment_id,
+                )
+                .where(
+                    SqlExperimentTag.key == project_tag,
+                    SqlExperimentTag.value != "",
+                ),
+            )
+        )
+        _set_backfilled(conn, experiments_projects)
+        return _count(conn, experiments_projects)
+
+
+def backfill_registered_models(engine: Engine, project_tag: str) -> int:
+    """Rebuild the registered models mapping from their project tags.
+
+    Returns:
+        The number of registered models mapped.
+    """
+    with engine.begin() as conn:
+        conn.execute(delete(registered_models_projects))
+        conn.execute(
+            insert(registered_models_projects).from_select(
+                ["name", "project_path"],
+                select(SqlRegisteredModelTag.name, SqlRegisteredModelTag.value).where(
+                    SqlRegisteredModelTag.key == project_tag,
+                    SqlRegisteredModelTag.value != "",
+                ),
+            )
+        )
+        _set_backfilled(conn, registered_models_projects)
+        return _count(conn, registered_models_projects)
+
+
+def _count(conn: Connection, table: Table) -> int:
+    return conn.execute(select(func.count()).select_from(table)).scalar_one()
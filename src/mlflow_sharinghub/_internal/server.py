@@ -19,14 +19,17 @@
 Utilities to interact with the server.
 """
 
+from collections.abc import Callable, Mapping
+from functools import wraps
 from typing import Any
-from urllib.parse import urlparse, urlunparse
+from urllib.parse import urlencode, urlparse, urlunparse
 
-from flask import request
+from flask import g, has_request_context, request
 from flask import url_for as flask_url_for
 from mlflow import MlflowException
 from mlflow.protos.databricks_pb2 import BAD_REQUEST, INVALID_PARAMETER_VALUE
 from mlflow.utils.rest_utils import _REST_API_PATH_PREFIX
+from werkzeug.datastructures import ImmutableMultiDict
 
 
 def is_unprotected_route(path: str) -> bool:
@@ -47,20 +50,58 @@ def is_proxy_artifact_path(path: str) -> bool:
     return path.startswith(f"{_REST_API_PATH_PREFIX}/mlflow-artifacts/artifacts/")
 
 
+def request_memoize[**P, R](func: Callable[P, R]) -> Callable[P, R]:
+    """Memoize the function results for the duration of the request.
+
+    Results are stored on `flask.g`, arguments must be hashable. Outside
+    of a request context the function is called as is.
+    """
+    memo_key = _request_memo_key(func)
+
+    @wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        if not has_request_context():
+            return func(*args, **kwargs)
+        memo = g.setdefault(memo_key, {})
+        key = (args, tuple(sorted(kwargs.items())))
+        if key not in memo:
+            memo[key] = func(*args, **kwargs)
+        return memo[key]
+
+    return wrapper
+
+
+def clear_request_memo(func: Callable[..., Any]) -> None:
+    """Drop the results memoized during the request for the function."""
+    if has_request_context():
+        g.pop(_request_memo_key(func), None)
+
+
+def _request_memo_key(func: Callable[..., Any]) -> str:
+    return f"sharinghub_memo_{func.__module__}.{func.__qualname__}"
+
+
+def get_request_params() -> Mapping[str, Any]:
+    """Get request params, from query string or JSON body.
+
+    Raises:
+        mlflow.MlflowException: If HTTP method is not supported.
+    """
+    if request.method == "GET":
+        return request.args
+    if request.method in ("POST", "PATCH", "DELETE"):
+        return request.json
+    msg = f"Unsupported HTTP method '{request.method}'"
+    raise MlflowException(msg, BAD_REQUEST)
+
+
 def get_request_param(param: str) -> str:
     """Get request param value.
 
     Raises:
         mlflow.MlflowException: If params is not found.
     """
-    if request.method == "GET":
-        args = request.args
-    elif request.method in ("POST", "PATCH", "DELETE"):
-        args = request.json
-    else:
-        msg = f"Unsupported HTTP method '{request.method}'"
-        raise MlflowException(msg, BAD_REQUEST)
-
+    args = get_request_params()
     if param not in args:
         # Special handling for run_id
         if param == "run_id":
@@ -70,6 +111,23 @@ def get_request_param(param: str) -> str:
     return args[param]
 
 
+def set_request_param(param: str, value: str) -> None:
+    """Set request param value, before the request is processed by MLflow.
+
+    Requests without a JSON object body are left unchanged.
+    """
+    if request.method == "GET":
+        args = request.args.copy()
+        args[param] = value
+        request.args = ImmutableMultiDict(args)
+        request.query_string = urlencode(list(args.items(multi=True))).encode()
+    elif request.method in ("POST", "PATCH", "DELETE"):
+        # Same call as MLflow, so that the parsed body is shared from the cache
+        body = request.get_json(force=True, silent=True)
+        if isinstance(body, dict):
+            body[param] = value
+
+
 def get_project_path() -> str | None:
     """Retrieve project path from environ.
 
@@ -19,29 +19,197 @@
 Utilities to interact with mlflow stores.
 """
 
-from typing import cast
+import logging
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager, suppress
+from functools import partial, reduce
+from itertools import batched
+from typing import Any, cast
 
+from flask import g, has_request_context
 from mlflow import MlflowException
-from mlflow.entities import Experiment
-from mlflow.protos.databricks_pb2 import RESOURCE_DOES_NOT_EXIST
+from mlflow.entities import Experiment, LifecycleStage
+from mlflow.entities.model_registry import RegisteredModel
+from mlflow.protos.databricks_pb2 import RESOURCE_DOES_NOT_EXIST, ErrorCode
+from mlflow.protos.model_registry_pb2 import SearchRegisteredModels
+from mlflow.protos.service_pb2 import SearchExperiments
+from mlflow.server import handlers as mlflow_handlers
 from mlflow.server.handlers import _get_model_registry_store, _get_tracking_store
+from mlflow.store.entities import PagedList
+from mlflow.store.model_registry import SEARCH_REGISTERED_MODEL_MAX_RESULTS_THRESHOLD
 from mlflow.store.model_registry.abstract_store import (
     AbstractStore as AbstractModelRegistryStore,
 )
+from mlflow.store.model_registry.dbmodels.models import (
+    SqlRegisteredModel,
+    SqlRegisteredModelTag,
+)
+from mlflow.store.model_registry.sqlalchemy_store import (
+    SqlAlchemyStore as SqlAlchemyModelRegistryStore,
+)
+from mlflow.store.tracking import SEARCH_MAX_RESULTS_THRESHOLD
 from mlflow.store.tracking.abstract_store import AbstractStore as AbstractTrackingStore
+from mlflow.store.tracking.dbmodels.models import (
+    SqlExperiment,
+    SqlExperimentTag,
+    SqlRun,
+)
+from mlflow.store.tracking.sqlalchemy_store import (
+    SqlAlchemyStore,
+    _get_search_experiments_filter_clauses,
+    _get_search_experiments_order_by_clauses,
+)
+from mlflow.utils.search_utils import (
+    SearchExperimentsUtils,
+    SearchModelUtils,
+    SearchUtils,
+)
+from mlflow.version import VERSION as MLFLOW_VERSION
+from sqlalchemy import Table, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, subqueryload
+
+from mlflow_sharinghub.config import AppConfig
+from mlflow_sharinghub.utils.cache import Cache, LRUCache, RedisCache, create_cache
+
+from . import projects_table
+
+_STORE_READ_PREFIXES = ("get_", "search_", "list_")
+
+# The searches in projects mirror the private search queries of the MLflow
+# SQL stores, they are only enabled for the MLflow version they were written for
+_SEARCH_QUERIES_MLFLOW_VERSION = "2.14."
+
+_logger = logging.getLogger(__name__)
+
+
+class _RequestMemoStore:
+    """Store proxy memoizing entities reads for the duration of a request.
+
+    Reads are memoized on `flask.g`, any other call is considered a write
+    and drops the memo of the store.
+    """
+
+    def __init__(self, store: Any, memoized_reads: Iterable[str]) -> None:
+        self._store = store
+        self._memoized_reads = frozenset(memoized_reads)
+        self._memo_key = f"sharinghub_store_memo_{id(store)}"
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._store, name)
+        if not callable(attr) or not has_request_context():
+            return attr
+        if name in self._memoized_reads:
+            return partial(self._read, name, attr)
+        if name.startswith(_STORE_READ_PREFIXES):
+            return attr
+        return partial(self._write, attr)
+
+    def _read(
+        self, name: str, read: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        memo = g.setdefault(self._memo_key, {})
+        key = (name, args, tuple(sorted(kwargs.items())))
+        if key not in memo:
+            memo[key] = read(*args, **kwargs)
+        return memo[key]
+
+    def _write(self, write: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        g.pop(self._memo_key, None)
+        return write(*args, **kwargs)
+
 
 _tracking_store = cast(AbstractTrackingStore, _get_tracking_store())
 _model_registry_store = cast(AbstractModelRegistryStore, _get_model_registry_store())
 
+# Request-scoped views of the stores, validators and mlflow handlers share them
+_memo_tracking_store = cast(
+    AbstractTrackingStore,
+    _RequestMemoStore(
+        _tracking_store, ("get_experiment", "get_experiment_by_name", "get_run")
+    ),
+)
+_memo_model_registry_store = cast(
+    AbstractModelRegistryStore,
+    _RequestMemoStore(
+        _model_registry_store, ("get_registered_model", "get_model_version")
+    ),
+)
+
+# Bound the number of parameters of the generated SQL IN clauses
+_SQL_IN_CHUNK_SIZE = 500
+
+# Projects tables whose sync failed in this process, not trusted anymore
+_unsynced_projects_tables: set[str] = set()
+
+# The experiment of a run never changes, no expiration needed
+_runs_experiment_id = LRUCache[str, str](
+    maxsize=AppConfig.RUN_CACHE_SIZE, name="runs_experiment_id"
+)
+# Neither does the project tag of the experiment, it is protected from updates
+_runs_project_path: Cache[str, str] = create_cache(
+    "runs_project_path", maxsize=AppConfig.RUN_CACHE_SIZE
+)
+
+# Experiments and registered models index, filled lazily and maintained by
+# the after-request hooks: experiment id -> (name, project path)
+_experiments_index: Cache[str, tuple[str, str]] = create_cache(
+    "experiments_index", maxsize=AppConfig.ENTITY_CACHE_SIZE
+)
+# Names are reused after renames and deletions, which only invalidate the
+# indexes of the worker serving them, unless the indexes are shared: the name
+# indexes are short-lived, and not trusted for updates if not shared.
+# experiment name -> experiment id
+_experiments_names_index: Cache[str, str] = create_cache(
+    "experiments_names_index",
+    maxsize=AppConfig.ENTITY_CACHE_SIZE,
+    timeout=AppConfig.ENTITY_NAME_CACHE_TIMEOUT,
+)
+# registered model name -> project path
+_registered_models_index: Cache[str, str] = create_cache(
+    "registered_models_index",
+    maxsize=AppConfig.ENTITY_CACHE_SIZE,
+    timeout=AppConfig.ENTITY_NAME_CACHE_TIMEOUT,
+)
+_shared_names_indexes = isinstance(_registered_models_index, RedisCache)
+
 
 def get_tracking_store() -> AbstractTrackingStore:
-    """Return mlflow tracking store."""
-    return _tracking_store
+    """Return mlflow tracking store, entities reads are memoized per request."""
+    return _memo_tracking_store
 
 
 def get_model_registry_store() -> AbstractModelRegistryStore:
-    """Return mlflow model registry store."""
-    return _model_registry_store
+    """Return mlflow model registry store, entities reads are memoized per request."""
+    return _memo_model_registry_store
+
+
+def share_stores_memo() -> None:
+    """Make mlflow handlers use the stores with memoized reads."""
+    mlflow_handlers._tracking_store = _memo_tracking_store  # noqa: SLF001
+    mlflow_handlers._model_registry_store = _memo_model_registry_store  # noqa: SLF001
+
+
+def setup_projects_table() -> None:
+    """Upgrade the projects tables schema, if enabled and the stores are SQL stores."""
+    for engine in (_get_tracking_engine(), _get_model_registry_engine()):
+        if engine is not None:
+            projects_table.upgrade(engine)
+
+
+def _get_tracking_engine() -> Engine | None:
+    if AppConfig.PROJECT_TABLE and isinstance(_tracking_store, SqlAlchemyStore):
+        return _tracking_store.engine
+    return None
+
+
+def _get_model_registry_engine() -> Engine | None:
+    if AppConfig.PROJECT_TABLE and isinstance(
+        _model_registry_store, SqlAlchemyModelRegistryStore
+    ):
+        return _model_registry_store.engine
+    return None
 
 
 def get_experiment_by_name(name: str) -> Experiment:
@@ -50,8 +218,366 @@ def get_experiment_by_name(name: str) -> Experiment:
     Raises:
         mlflow.MlflowException: If experiment was not found.
     """
-    experiment = _tracking_store.get_experiment_by_name(name)
+    experiment = _memo_tracking_store.get_experiment_by_name(name)
     if experiment is None:
         msg = f"Could not find experiment with name {name}"
         raise MlflowException(msg, error_code=RESOURCE_DOES_NOT_EXIST)
     return experiment
+
+
+def get_experiment_project_path(experiment_id: str) -> str:
+    """Return the project path of the experiment, from the index.
+
+    Raises:
+        mlflow.MlflowException: If experiment was not found.
+    """
+    return _get_indexed_experiment(experiment_id)[1]
+
+
+def get_experiment_name(experiment_id: str) -> str:
+    """Return the name of the experiment, from the index.
+
+    Raises:
+        mlflow.MlflowException: If experiment was not found.
+    """
+    return _get_indexed_experiment(experiment_id)[0]
+
+
+def get_experiment_project_path_by_name(name: str) -> str:
+    """Return the project path of the experiment with given name, from the index.
+
+    Raises:
+        mlflow.MlflowException: If experiment was not found.
+    """
+    if (experiment_id := _experiments_names_index.get(name)) is not None:
+        indexed = _experiments_index.get(experiment_id)
+        # the experiment may have been renamed since
+        if indexed is not None and indexed[0] == name:
+            return indexed[1]
+    experiment = get_experiment_by_name(name)
+    return _index_experiment(experiment)[1]
+
+
+def _get_indexed_experiment(experiment_id: str) -> tuple[str, str]:
+    if (indexed := _experiments_index.get(experiment_id)) is None:
+        experiment = _memo_tracking_store.get_experiment(experiment_id)
+        indexed = _index_experiment(experiment)
+    return indexed
+
+
+def _index_experiment(experiment: Experiment) -> tuple[str, str]:
+    project_path = experiment.tags.get(AppConfig.PROJECT_TAG, "")
+    index_experiment(experiment.experiment_id, experiment.name, project_path)
+    return experiment.name, project_path
+
+
+def index_experiment(experiment_id: str, name: str, project_path: str) -> None:
+    """Save the experiment in the index."""
+    _experiments_index.set(experiment_id, (name, project_path))
+    _experiments_names_index.set(name, experiment_id)
+
+
+def forget_experiment(experiment_id: str) -> None:
+    """Drop the experiment from the index."""
+    _experiments_index.delete(experiment_id)
+
+
+def save_experiment_project(experiment_id: str, name: str, project_path: str) -> None:
+    """Save the experiment project in the projects table, if enabled."""
+    if (engine := _get_tracking_engine()) is not None:
+        with _syncing(engine, projects_table.experiments_projects):
+            projects_table.save_experiment(engine, experiment_id, name, project_path)
+
+
+def sync_experiment_project(experiment_id: str) -> None:
+    """Save the experiment project in the projects table from the store."""
+    if (engine := _get_tracking_engine()) is not None:
+        name, project_path = _get_indexed_experiment(experiment_id)
+        with _syncing(engine, projects_table.experiments_projects):
+            projects_table.save_experiment(engine, experiment_id, name, project_path)
+
+
+def get_registered_model_project_path(name: str, for_update: bool = False) -> str:
+    """Return the project path of the registered model, from the index.
+
+    For updates, the index is only trusted if shared between the workers,
+    the project path is read from the store otherwise.
+
+    Raises:
+        mlflow.MlflowException: If registered model was not found.
+    """
+    project_path = None
+    if _shared_names_indexes or not for_update:
+        project_path = _registered_models_index.get(name)
+    if project_path is None:
+        registered_model = _memo_model_registry_store.get_registered_model(name)
+        project_path = registered_model.tags.get(AppConfig.PROJECT_TAG, "")
+        index_registered_model(name, project_path)
+    return project_path
+
+
+def index_registered_model(name: str, project_path: str) -> None:
+    """Save the registered model in the index."""
+    _registered_models_index.set(name, project_path)
+
+
+def forget_registered_model(name: str) -> None:
+    """Drop the registered model from the index."""
+    _registered_models_index.delete(name)
+
+
+def save_registered_model_project(
+    name: str, project_path: str, old_name: str | None = None
+) -> None:
+    """Save the registered model project in the projects table, if enabled."""
+    if (engine := _get_model_registry_engine()) is not None:
+        with _syncing(engine, projects_table.registered_models_projects):
+            projects_table.save_registered_model(engine, name, project_path, old_name)
+
+
+def delete_registered_model_project(name: str) -> None:
+    """Delete the registered model project from the projects table, if enabled."""
+    if (engine := _get_model_registry_engine()) is not None:
+        with _syncing(engine, projects_table.registered_models_projects):
+            projects_table.delete_registered_model(engine, name)
+
+
+@contextmanager
+def _syncing(engine: Engine, table: Table) -> Iterator[None]:
+    """Drop the projects table backfill if its sync fails.
+
+    The table is written after the MLflow store transaction, the entity
+    change is already committed: the searches fall back to the entities tags
+    until the table is backfilled again.
+    """
+    try:
+        yield
+    except SQLAlchemyError:
+        _logger.exception(
+            "Projects table %s is out of sync, searches use the project tags "
+            "until `mlflow-sharinghub backfill-projects` is run again",
+            table.name,
+        )
+        _unsynced_projects_tables.add(table.name)
+        with suppress(SQLAlchemyError):
+            projects_table.clear_backfilled(engine, table)
+
+
+def _use_projects_table(session: Session, table: Table) -> bool:
+    """Assert if the searches can use the projects table, else the tags."""
+    return (
+        AppConfig.PROJECT_TABLE
+        and table.name not in _unsynced_projects_tables
+        and projects_table.is_backfilled(session, table)
+    )
+
+
+def get_run_project_path(run_id: str) -> str:
+    """Return the project path of the run experiment.
+
+    Cached, so that the write-path authorization needs no store read.
+
+    Raises:
+        mlflow.MlflowException: If run was not found.
+    """
+    if (project_path := _runs_project_path.get(run_id)) is None:
+        experiment_id = get_runs_experiment_ids([run_id]).get(run_id)
+        if experiment_id is None:
+            msg = f"Run with id={run_id} not found"
+            raise MlflowException(msg, error_code=RESOURCE_DOES_NOT_EXIST)
+        project_path = get_experiment_project_path(experiment_id)
+        _runs_project_path.set(run_id, project_path)
+    return project_path
+
+
+def forget_run(run_id: str) -> None:
+    """Drop the cached data of the run."""
+    _runs_experiment_id.delete(run_id)
+    _runs_project_path.delete(run_id)
+
+
+def get_runs_experiment_ids(run_ids: Iterable[str]) -> dict[str, str]:
+    """Return the experiment id of each run, runs not found are omitted.
+
+    The runs not already cached are fetched in bulk.
+    """
+    runs_experiment_id = {}
+    missing = []
+    for run_id in set(run_ids):
+        if not run_id:
+            continue
+        if (experiment_id := _runs_experiment_id.get(run_id)) is not None:
+            runs_experiment_id[run_id] = experiment_id
+        else:
+            missing.append(run_id)
+
+    if missing:
+        fetched = _fetch_runs_experiment_ids(missing)
+        for run_id, experiment_id in fetched.items():
+            _runs_experiment_id.set(run_id, experiment_id)
+        runs_experiment_id |= fetched
+    return runs_experiment_id
+
+
+def _fetch_runs_experiment_ids(run_ids: list[str]) -> dict[str, str]:
+    if isinstance(_tracking_store, SqlAlchemyStore):
+        runs_experiment_id = {}
+        with _tracking_store.ManagedSessionMaker() as session:
+            for chunk in batched(run_ids, _SQL_IN_CHUNK_SIZE):
+                rows = (
+                    session.query(SqlRun.run_uuid, SqlRun.experiment_id)
+                    .filter(SqlRun.run_uuid.in_(chunk))
+                    .all()
+                )
+                runs_experiment_id |= {
+                    run_uuid: str(experiment_id) for run_uuid, experiment_id in rows
+                }
+        return runs_experiment_id
+
+    runs_experiment_id = {}
+    for run_id in run_ids:
+        try:
+            run = _memo_tracking_store.get_run(run_id)
+        except MlflowException as err:
+            if err.error_code != ErrorCode.Name(RESOURCE_DOES_NOT_EXIST):
+                raise
+        else:
+            runs_experiment_id[run_id] = run.info.experiment_id
+    return runs_experiment_id
+
+
+def can_search_experiments_in_projects() -> bool:
+    """Assert if the tracking store supports `search_experiments_in_projects`."""
+    return MLFLOW_VERSION.startswith(_SEARCH_QUERIES_MLFLOW_VERSION) and isinstance(
+        _tracking_store, SqlAlchemyStore
+    )
+
+
+def search_experiments_in_projects(
+    project_paths: Sequence[str], request_message: SearchExperiments, page_token: str
+) -> PagedList[Experiment]:
+    """Search experiments, restricted to the experiments of the given projects.
+
+    The restriction is a store-side predicate on the projects table once
+    backfilled, on the experiment tags table otherwise, so it is only
+    available for SQL stores (see `can_search_experiments_in_projects`).
+    """
+    max_results = request_message.max_results
+    _check_max_results(max_results, SEARCH_MAX_RESULTS_THRESHOLD)
+
+    with _tracking_store.ManagedSessionMaker() as session:
+        parsed_filters = SearchExperimentsUtils.parse_search_filter(
+            request_message.filter
+        )
+        attribute_filters, non_attribute_filters = (
+            _get_search_experiments_filter_clauses(
+                parsed_filters, _tracking_store.engine.dialect.name
+            )
+        )
+        project_filter = SqlExperiment.experiment_id.in_(
+            projects_table.select_experiments_ids(project_paths)
+            if _use_projects_table(session, projects_table.experiments_projects)
+            else select(SqlExperimentTag.experiment_id).where(
+                SqlExperimentTag.key == AppConfig.PROJECT_TAG,
+                SqlExperimentTag.value.in_(project_paths),
+            )
+        )
+        offset = SearchUtils.parse_start_offset_from_page_token(page_token)
+        lifecycle_stages = set(
+            LifecycleStage.view_type_to_stages(request_message.view_type)
+        )
+        stmt = (
+            reduce(
+                lambda s, f: s.join(f),
+                non_attribute_filters,
+                select(SqlExperiment),
+            )
+            .options(subqueryload(SqlExperiment.tags))
+            .filter(
+                *attribute_filters,
+                project_filter,
+                SqlExperiment.lifecycle_stage.in_(lifecycle_stages),
+            )
+            .order_by(
+                *_get_search_experiments_order_by_clauses(request_message.order_by)
+            )
+            .offset(offset)
+            .limit(max_results + 1)
+        )
+        experiments = [
+            e.to_mlflow_entity() for e in session.execute(stmt).scalars().all()
+        ]
+    return _make_paged_list(experiments, offset, max_results)
+
+
+def can_search_registered_models_in_projects() -> bool:
+    """Assert if the registry store supports `search_registered_models_in_projects`."""
+    return MLFLOW_VERSION.startswith(_SEARCH_QUERIES_MLFLOW_VERSION) and isinstance(
+        _model_registry_store, SqlAlchemyModelRegistryStore
+    )
+
+
+def search_registered_models_in_projects(
+    project_paths: Sequence[str],
+    request_message: SearchRegisteredModels,
+    page_token: str,
+) -> PagedList[RegisteredModel]:
+    """Search registered models, restricted to the models of the given projects.
+
+    The restriction is a store-side predicate on the projects table once
+    backfilled, on the registered model tags table otherwise, so it is only
+    available for SQL stores (see `can_search_registered_models_in_projects`).
+    """
+    max_results = request_message.max_results
+    _check_max_results(max_results, SEARCH_REGISTERED_MODEL_MAX_RESULTS_THRESHOLD)
+
+    store_cls = SqlAlchemyModelRegistryStore
+    parsed_filters = SearchModelUtils.parse_search_filter(request_message.filter)
+    filter_query = store_cls._get_search_registered_model_filter_query(  # noqa: SLF001
+        parsed_filters, _model_registry_store.engine.dialect.name
+    )
+    order_by_clauses = store_cls._parse_search_registered_models_order_by(  # noqa: SLF001
+        request_message.order_by
+    )
+    offset = SearchUtils.parse_start_offset_from_page_token(page_token)
+    with _model_registry_store.ManagedSessionMaker() as session:
+        project_filter = SqlRegisteredModel.name.in_(
+            projects_table.select_registered_models_names(project_paths)
+            if _use_projects_table(session, projects_table.registered_models_projects)
+            else select(SqlRegisteredModelTag.name).where(
+                SqlRegisteredModelTag.key == AppConfig.PROJECT_TAG,
+                SqlRegisteredModelTag.value.in_(project_paths),
+            )
+        )
+        stmt = (
+            filter_query.filter(project_filter)
+            .options(subqueryload(SqlRegisteredModel.registered_model_tags))
+            .order_by(*order_by_clauses)
+            .offset(offset)
+            .limit(max_results + 1)
+        )
+        registered_models = [
+            rm.to_mlflow_entity() for rm in session.execute(stmt).scalars().all()
+        ]
+    return _make_paged_list(registered_models, offset, max_results)
+
+
+def _check_max_results(max_results: int, threshold: int) -> None:
+    if max_results < 1 or max_results > threshold:
+        msg = (
+            "Invalid value for request parameter max_results. It must be at most "
+            f"{threshold}, but got value {max_results}"
+        )
+        raise MlflowException.invalid_parameter_value(msg)
+
+
+def _make_paged_list[T](
+    entities: list[T], offset: int, max_results: int
+) -> PagedList[T]:
+    """Make the page from the entities fetched with a limit of max_results + 1."""
+    next_page_token = (
+        SearchUtils.create_page_token(offset + max_results)
+        if len(entities) > max_results
+        else None
+    )
+    return PagedList(entities[:max_results], next_page_token)
@@ -27,6 +27,7 @@ from flask_session import Session
 from mlflow.server import app as mlflow_app
 
 from mlflow_sharinghub import auth, config, hooks
+from mlflow_sharinghub._internal import store
 from mlflow_sharinghub.utils.http import HTTP_METHODS
 
 
@@ -59,10 +60,20 @@ def create_app(app: Flask = mlflow_app) -> Flask:
     and delegates the calls to the mlflow server app, while operating
     before and after requests hooks to alter the behavior.
     Also adds authentication routes.
+
+    Raises:
+        RuntimeError: If no secret key is configured.
     """
-    # Configure
+    # Configure, sessions and page tokens signed by a worker are read by others
+    if not config.AppConfig.SECRET_KEY:
+        msg = "SECRET_KEY must be set, shared by all the server workers."
+        raise RuntimeError(msg)
     app.config.from_object(config.AppConfig)
 
+    # Stores
+    store.share_stores_memo()
+    store.setup_projects_table()
+
     # Requests hooks
     app.before_request(hooks.before_request_hook)
     app.after_request(hooks.after_request_hook)
@@ -19,6 +19,7 @@
 from .api import (
     RequestAuth,
     get_request_auth,
+    get_request_username,
     is_authenticated,
     make_unauthorized_response,
 )
@@ -29,6 +30,7 @@ __all__ = [
     "bp",
     "oauth",
     "get_request_auth",
+    "get_request_username",
     "is_authenticated",
     "make_unauthorized_response",
     "RequestAuth",
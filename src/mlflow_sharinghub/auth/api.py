@@ -25,18 +25,36 @@ import requests
 from flask import Response, make_response, redirect, render_template, request, session
 
 from mlflow_sharinghub import __version__ as plugin_version
-from mlflow_sharinghub._internal.server import get_project_path, url_for
+from mlflow_sharinghub._internal.server import (
+    clear_request_memo,
+    get_project_path,
+    request_memoize,
+    url_for,
+)
 from mlflow_sharinghub.config import AppConfig
-from mlflow_sharinghub.utils.http import HTTP_OK, clean_url, make_auth_response
-from mlflow_sharinghub.utils.session import TimedSessionStore
-
-_AUTH_REQUEST_TIMEOUT = 10
+from mlflow_sharinghub.utils.cache import Cache, create_cache, hash_key
+from mlflow_sharinghub.utils.http import (
+    HTTP_FORBIDDEN,
+    HTTP_OK,
+    HTTP_UNAUTHORIZED,
+    clean_url,
+    get_http_session,
+    make_auth_response,
+)
 
-_session_auth = TimedSessionStore[str, bool](
-    "auth", timeout=AppConfig.SHARINGHUB_AUTH_CACHE_TIMEOUT
+# Token validation results, keyed by credentials fingerprint: the username of
+# the authenticated user, empty if the credentials were rejected
+_auth_cache: Cache[str, str] = create_cache(
+    "auth",
+    maxsize=AppConfig.AUTH_CACHE_SIZE,
+    timeout=AppConfig.SHARINGHUB_AUTH_CACHE_TIMEOUT,
 )
 
 
+_ANONYMOUS_USERNAME = "anonymous"
+_UNKNOWN_USERNAME = "unknown"
+
+
 @dataclass
 class RequestAuth:
     """Wrap request authentication info for clients."""
@@ -44,6 +62,15 @@ class RequestAuth:
     headers: dict[str, str] = field(default_factory=dict)
     cookies: dict[str, str] = field(default_factory=dict)
 
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the credentials, usable as a cache key."""
+        return hash_key(sorted(self.headers.items()), sorted(self.cookies.items()))
+
+    def __hash__(self) -> int:
+        """Hash of the credentials, auth details are not modified once created."""
+        return hash(self.fingerprint)
+
 
 def get_session_auth() -> dict:
     """Returns the auth-related session data."""
@@ -52,41 +79,74 @@ def get_session_auth() -> dict:
 
 def clear_auth_cache() -> None:
     """Clear auth cache."""
-    return _session_auth.clear()
+    if request_auth := get_request_auth():
+        _auth_cache.delete(request_auth.fingerprint)
+    get_session_auth().clear()
+    clear_request_memo(get_request_auth)
 
 
 def is_authenticated() -> bool:
     """Return True if user is authenticated."""
     request_auth = get_request_auth()
     if request_auth and AppConfig.GITLAB_URL:
-        authenticated = _session_auth.get("gitlab")
-        if authenticated is None:
-            resp = requests.get(
-                clean_url(AppConfig.GITLAB_URL) + "/api/v4/user",
-                headers=request_auth.headers,
-                timeout=_AUTH_REQUEST_TIMEOUT,
-            )
-            authenticated = resp.status_code == HTTP_OK
-        return authenticated
+        return _check_authentication(request_auth, AppConfig.GITLAB_URL, "/api/v4/user")
     if (
         request_auth
         and AppConfig.SHARINGHUB_URL
         and not AppConfig.SHARINGHUB_AUTH_DEFAULT_TOKEN
     ):
-        authenticated = _session_auth.get("sharinghub")
-        if authenticated is None:
-            resp = requests.get(
-                clean_url(AppConfig.SHARINGHUB_URL) + "/api/auth/info",
-                headers=request_auth.headers,
-                cookies=request_auth.cookies,
-                timeout=_AUTH_REQUEST_TIMEOUT,
-            )
-            authenticated = resp.status_code == HTTP_OK
-            _session_auth.set("sharinghub", authenticated)
-        return authenticated
+        return _check_authentication(
+            request_auth, AppConfig.SHARINGHUB_URL, "/api/auth/info"
+        )
     return request_auth is not None
 
 
+def _check_authentication(
+    request_auth: RequestAuth, base_url: str, endpoint: str
+) -> bool:
+    """Validate credentials against the given endpoint, with cache."""
+    username = _auth_cache.get(request_auth.fingerprint)
+    if username is None:
+        resp = get_http_session(base_url).get(
+            clean_url(base_url) + endpoint,
+            headers=request_auth.headers,
+            cookies=request_auth.cookies,
+            timeout=AppConfig.HTTP_AUTH_REQUEST_TIMEOUT,
+        )
+        username = _read_username(resp) if resp.status_code == HTTP_OK else ""
+        # Do not cache upstream errors, only definitive answers
+        if resp.status_code in (HTTP_OK, HTTP_UNAUTHORIZED, HTTP_FORBIDDEN):
+            _auth_cache.set(request_auth.fingerprint, username)
+    return bool(username)
+
+
+def _read_username(resp: requests.Response) -> str:
+    """Read the username from the GitLab user or the SharingHub auth info."""
+    try:
+        user_info = resp.json()
+    except ValueError:
+        return _UNKNOWN_USERNAME
+    if isinstance(user_info, dict):
+        user = user_info.get("user", user_info)
+        if isinstance(user, dict) and (username := user.get("username")):
+            return str(username)
+    return _UNKNOWN_USERNAME
+
+
+def get_request_username() -> str:
+    """Return the username of the requester, for the logs and statistics.
+
+    Read from the OpenID user info, or from the credentials validation.
+    """
+    request_auth = get_request_auth()
+    if request_auth is None:
+        return _ANONYMOUS_USERNAME
+    if username := (get_session_auth().get("userinfo") or {}).get("nickname"):
+        return username
+    return _auth_cache.get(request_auth.fingerprint) or _UNKNOWN_USERNAME
+
+
+@request_memoize
 def get_request_auth() -> RequestAuth | None:
     """Return auth details if user is authenticated."""
     if AppConfig.GITLAB_URL:
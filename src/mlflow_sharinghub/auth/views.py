@@ -19,17 +19,31 @@
 Declare the blueprint for the views related to the authentication process.
 """
 
-from flask import Blueprint, Response, redirect, request
+from contextlib import suppress
 
-from mlflow_sharinghub._internal.server import url_for
+import requests
+from flask import Blueprint, Response, jsonify, redirect, request
+from mlflow import MlflowException
+
+from mlflow_sharinghub import permissions
+from mlflow_sharinghub._internal.server import clear_request_memo, url_for
 from mlflow_sharinghub.config import AppConfig
+from mlflow_sharinghub.utils.cache import get_caches_stats
 from mlflow_sharinghub.utils.http import (
     clean_url,
     make_internal_error_response,
     url_add_query_params,
 )
-
-from .api import clear_auth_cache, get_session_auth, make_login_page
+from mlflow_sharinghub.utils.stats import get_counters_stats
+
+from .api import (
+    clear_auth_cache,
+    get_request_auth,
+    get_session_auth,
+    is_authenticated,
+    make_login_page,
+    make_unauthorized_response,
+)
 from .client import GITLAB_CLIENT, oauth
 
 bp = Blueprint("auth", __name__, template_folder="templates")
@@ -83,6 +97,12 @@ def authorize() -> Response:
     session_auth["access_token"] = token.get("access_token")
     session_auth["refresh_token"] = token.get("refresh_token")
     session_auth["userinfo"] = token.get("userinfo")
+    clear_request_memo(get_request_auth)
+
+    # Warm the permission cache, login must not fail because of it
+    if request_auth := get_request_auth():
+        with suppress(requests.RequestException, MlflowException):
+            permissions.prefetch_access_levels(request_auth)
 
     return redirect(
         url_for("serve", _project=session_auth.get(_REDIRECT_PROJECT_SESSION_KEY))
@@ -94,6 +114,18 @@ def logout() -> Response:
     """Remove the token from the auth session."""
     session_auth = get_session_auth()
     session_auth.clear()
+    clear_request_memo(get_request_auth)
     if AppConfig.LOGIN_AUTO_REDIRECT:
         return redirect(url_for("auth.index"))
     return redirect(url_for("serve"))
+
+
+@bp.route("/cache-stats")
+def cache_stats() -> Response:
+    """Returns the counters of the worker caches, and the worker counters.
+
+    Unlike the other auth routes, reserved to authenticated users.
+    """
+    if not is_authenticated():
+        return make_unauthorized_response()
+    return jsonify(get_caches_stats() | get_counters_stats())
@@ -0,0 +1,71 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""CLI module.
+
+Maintenance commands of the plugin, run against the MLflow backend database.
+"""
+
+import click
+from mlflow.store.db.utils import create_sqlalchemy_engine_with_retry
+
+from mlflow_sharinghub._internal import projects_table
+
+
+@click.group()
+def cli() -> None:
+    """MLflow SharingHub plugin commands."""
+
+
+@cli.command("backfill-projects")
+@click.option(
+    "--backend-store-uri",
+    required=True,
+    help="SQL URI of the MLflow tracking backend store.",
+)
+@click.option(
+    "--registry-store-uri",
+    default=None,
+    help="SQL URI of the MLflow model registry store, default to backend store.",
+)
+@click.option(
+    "--project-tag",
+    envvar="PROJECT_TAG",
+    default="project",
+    show_default=True,
+    help="Tag holding the project path of the entities.",
+)
+def backfill_projects(
+    backend_store_uri: str, registry_store_uri: str | None, project_tag: str
+) -> None:
+    """Upgrade the projects tables and fill them from the entities project tags.
+
+    Until filled, the searches use the entities project tags. To run before
+    enabling PROJECT_TABLE, and again if the tables get out of sync.
+    """
+    tracking_engine = create_sqlalchemy_engine_with_retry(backend_store_uri)
+    registry_engine = (
+        create_sqlalchemy_engine_with_retry(registry_store_uri)
+        if registry_store_uri
+        else tracking_engine
+    )
+    projects_table.upgrade(tracking_engine)
+    projects_table.upgrade(registry_engine)
+
+    count = projects_table.backfill_experiments(tracking_engine, project_tag)
+    click.echo(f"Experiments mapped: {count}")
+    count = projects_table.backfill_registered_models(registry_engine, project_tag)
+    click.echo(f"Registered models mapped: {count}")
@@ -20,8 +20,18 @@ from dataclasses import dataclass
 from typing import Protocol, runtime_checkable
 
 from mlflow_sharinghub.auth import RequestAuth
+from mlflow_sharinghub.config import AppConfig
+from mlflow_sharinghub.utils.cache import Cache, create_cache
 from mlflow_sharinghub.utils.gitlab import GitlabRole
 
+# User-independent projects metadata, shared by all the users for a longer
+# time than their roles: project path -> (id, topics)
+_projects_metadata: Cache[str, tuple[int, list[str]]] = create_cache(
+    "projects_metadata",
+    maxsize=AppConfig.PROJECT_CACHE_SIZE,
+    timeout=AppConfig.PROJECT_METADATA_CACHE_TIMEOUT,
+)
+
 
 @dataclass
 class ProjectInfo:
@@ -32,6 +42,15 @@ class ProjectInfo:
     role: GitlabRole
 
 
+@dataclass
+class ProjectMetadata:
+    """Project info independent of the user."""
+
+    id: int
+    path: str
+    topics: list[str]
+
+
 @runtime_checkable
 class ProjectClient(Protocol):
     """Project client with request methods."""
@@ -40,3 +59,23 @@ class ProjectClient(Protocol):
 
     def get_project(self, path: str) -> ProjectInfo | None:
         """Retrieve the project from its path (with namespace) or None."""
+
+    def list_projects(self) -> list[ProjectInfo] | None:
+        """Retrieve all the projects readable by the user.
+
+        Returns None if the listing is not available or was truncated
+        (more than PROJECT_PREFETCH_MAX_PAGES pages).
+        """
+
+
+def get_project_metadata(path: str) -> ProjectMetadata | None:
+    """Return the cached metadata of the project, or None."""
+    if (metadata := _projects_metadata.get(path)) is None:
+        return None
+    project_id, topics = metadata
+    return ProjectMetadata(id=project_id, path=path, topics=list(topics))
+
+
+def save_project_metadata(metadata: ProjectMetadata) -> None:
+    """Store the project metadata in cache."""
+    _projects_metadata.set(metadata.path, (metadata.id, metadata.topics))
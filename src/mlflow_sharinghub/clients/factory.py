@@ -20,6 +20,7 @@ Define factory method used to instantiate project client based
 on configured auth mode.
 """
 
+from mlflow_sharinghub._internal.server import request_memoize
 from mlflow_sharinghub.auth import RequestAuth
 from mlflow_sharinghub.config import AppConfig
 
@@ -28,8 +29,12 @@ from .gitlab import GitlabClient
 from .sharinghub import SharinghubClient
 
 
+@request_memoize
 def create_client(request_auth: RequestAuth) -> ProjectClient:
-    """Returns project client based on configuration."""
+    """Returns project client based on configuration.
+
+    A single client is created per request for the same auth details.
+    """
     if AppConfig.GITLAB_URL:
         return GitlabClient(url=AppConfig.GITLAB_URL, request_auth=request_auth)
 
@@ -23,16 +23,32 @@ import requests
 
 from mlflow_sharinghub.auth import RequestAuth
 from mlflow_sharinghub.config import AppConfig
-from mlflow_sharinghub.utils.gitlab import GitlabREST_Project, GitlabRole
+from mlflow_sharinghub.utils.cache import Cache, create_cache
+from mlflow_sharinghub.utils.gitlab import GUEST, GitlabREST_Project, GitlabRole
 from mlflow_sharinghub.utils.http import (
     HTTP_NOT_FOUND,
     clean_url,
+    get_http_session,
     urlsafe_path,
 )
 
-from .base import ProjectClient, ProjectInfo
+from .base import (
+    ProjectClient,
+    ProjectInfo,
+    ProjectMetadata,
+    get_project_metadata,
+    save_project_metadata,
+)
 
 _TOPICS = [*AppConfig.GITLAB_MANDATORY_TOPICS]
+_PER_PAGE = 100
+
+# GitLab user id, keyed by credentials fingerprint
+_users_id: Cache[str, int] = create_cache(
+    "users_id",
+    maxsize=AppConfig.AUTH_CACHE_SIZE,
+    timeout=AppConfig.PROJECT_METADATA_CACHE_TIMEOUT,
+)
 
 
 class GitlabClient(ProjectClient):
@@ -46,29 +62,122 @@ class GitlabClient(ProjectClient):
         self.rest_url = f"{self.api_url}/v4"
         self.headers = request_auth.headers
         self.cookies = request_auth.cookies
+        self.session = get_http_session(self.url)
 
     def get_project(self, path: str) -> ProjectInfo | None:
-        """Retrieve the project from its path (with namespace) or None."""
-        path = urlsafe_path(path)
-        url = self._resolve_rest_api_url(f"/projects/{path}?simple=true")
-        try:
-            response = requests.get(
-                url=url, headers=self.headers, cookies=self.cookies, timeout=30
+        """Retrieve the project from its path (with namespace) or None.
+
+        With the project metadata cached, the mandatory topics are checked
+        without request, and only the user membership is fetched, by project
+        and user ids, instead of the whole project. A moved project is then
+        known by its former path until its metadata expires, after
+        PROJECT_METADATA_CACHE_TIMEOUT.
+        """
+        if (metadata := get_project_metadata(path)) is not None:
+            if not _has_mandatory_topics(metadata.topics):
+                return None
+            role = self._get_member_role(metadata.id)
+            if role is None:
+                # Not visible by, or not a member of the project
+                return None
+            return ProjectInfo(id=metadata.id, path=path, role=role)
+
+        project_data = self._get_project_data(urlsafe_path(path))
+        if project_data is None:
+            return None
+        save_project_metadata(_get_metadata(project_data, path))
+        if not _has_mandatory_topics(project_data["topics"]):
+            return None
+        return ProjectInfo(
+            id=project_data["id"],
+            path=path,
+            role=GitlabRole.from_gitlab_project(project_data),
+        )
+
+    def list_projects(self) -> list[ProjectInfo] | None:
+        """Retrieve all the projects readable by the user.
+
+        Returns None if the listing is not available or was truncated
+        (more than PROJECT_PREFETCH_MAX_PAGES pages).
+        """
+        url: str | None = self._resolve_rest_api_url(
+            f"/projects?membership=true&min_access_level={GUEST.access_level}"
+            f"&per_page={_PER_PAGE}"
+        )
+        projects = []
+        for _ in range(AppConfig.PROJECT_PREFETCH_MAX_PAGES):
+            response = self.session.get(
+                url=url,
+                headers=self.headers,
+                cookies=self.cookies,
+                timeout=AppConfig.HTTP_REQUEST_TIMEOUT,
             )
             response.raise_for_status()
-            project_data: GitlabREST_Project = response.json()
-            if _TOPICS and not set(_TOPICS).issubset(project_data["topics"]):
+            projects_data: list[GitlabREST_Project] = response.json()
+            for project_data in projects_data:
+                save_project_metadata(
+                    _get_metadata(project_data, project_data["path_with_namespace"])
+                )
+            projects.extend(
+                ProjectInfo(
+                    id=project_data["id"],
+                    path=project_data["path_with_namespace"],
+                    role=GitlabRole.from_gitlab_project(project_data),
+                )
+                for project_data in projects_data
+                if _has_mandatory_topics(project_data["topics"])
+            )
+            url = response.links.get("next", {}).get("url")
+            if not url:
+                return projects
+        return None
+
+    def _get_project_data(self, project_id: int | str) -> GitlabREST_Project | None:
+        return self._get_json(f"/projects/{project_id}?simple=true")
+
+    def _get_member_role(self, project_id: int) -> GitlabRole | None:
+        """Return the user role in the project, inherited ones included."""
+        if (user_id := self._get_user_id()) is None:
+            return None
+        member_data = self._get_json(f"/projects/{project_id}/members/all/{user_id}")
+        if member_data is None:
+            return None
+        return GitlabRole.from_access_level(member_data["access_level"])
+
+    def _get_user_id(self) -> int | None:
+        key = self.request_auth.fingerprint
+        if (user_id := _users_id.get(key)) is None:
+            if (user_data := self._get_json("/user")) is None:
                 return None
-            return ProjectInfo(
-                id=project_data["id"],
-                path=path,
-                role=GitlabRole.from_gitlab_project(project_data),
+            user_id = user_data["id"]
+            _users_id.set(key, user_id)
+        return user_id
+
+    def _get_json(self, endpoint: str) -> dict | None:
+        try:
+            response = self.session.get(
+                url=self._resolve_rest_api_url(endpoint),
+                headers=self.headers,
+                cookies=self.cookies,
+                timeout=AppConfig.HTTP_REQUEST_TIMEOUT,
             )
+            response.raise_for_status()
         except requests.HTTPError as err:
             if err.response.status_code == HTTP_NOT_FOUND:
                 return None
             raise
+        return response.json()
 
     def _resolve_rest_api_url(self, endpoint: str) -> str:
         endpoint = endpoint.removeprefix("/")
         return f"{self.rest_url}/{endpoint}"
+
+
+def _has_mandatory_topics(topics: list[str]) -> bool:
+    return not _TOPICS or set(_TOPICS).issubset(topics)
+
+
+def _get_metadata(project_data: GitlabREST_Project, path: str) -> ProjectMetadata:
+    return ProjectMetadata(
+        id=project_data["id"], path=path, topics=project_data["topics"]
+    )
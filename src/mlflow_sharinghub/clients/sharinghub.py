@@ -33,12 +33,22 @@ from mlflow_sharinghub.utils.gitlab import (
 from mlflow_sharinghub.utils.http import (
     HTTP_NOT_FOUND,
     clean_url,
+    get_http_session,
     urlsafe_path,
 )
 
-from .base import ProjectClient, ProjectInfo
+from .base import (
+    ProjectClient,
+    ProjectInfo,
+    ProjectMetadata,
+    get_project_metadata,
+    save_project_metadata,
+)
 
 _CATEGORY = AppConfig.SHARINGHUB_STAC_COLLECTION
+_PER_PAGE = 100
+_STAC_ID_PROPERTY = "sharinghub:id"
+_STAC_ACCESS_LEVEL_PROPERTY = "sharinghub:access-level"
 
 _ACCESS_LEVEL_MAPPING = {
     0: NO_ACCESS,
@@ -58,19 +68,37 @@ class SharinghubClient(ProjectClient):
 
         self.api_url = f"{self.url}/api"
         self.checker_url = f"{self.api_url}/check"
+        self.stac_search_url = f"{self.api_url}/stac/search"
         self.headers = request_auth.headers
         self.cookies = request_auth.cookies
+        self.session = get_http_session(self.url)
 
     def get_project(self, path: str) -> ProjectInfo | None:
-        """Retrieve the project from its path (with namespace) or None."""
-        path = urlsafe_path(path)
-        url = self._resolve_check_url(stac_id=path)
+        """Retrieve the project from its path (with namespace) or None.
+
+        With the project metadata cached, projects outside of the category
+        are rejected without request.
+        """
+        metadata = get_project_metadata(path)
+        if metadata is not None and _CATEGORY not in metadata.topics:
+            return None
+        url = self._resolve_check_url(stac_id=urlsafe_path(path))
         try:
-            response = requests.get(
-                url=url, headers=self.headers, cookies=self.cookies, timeout=30
+            response = self.session.get(
+                url=url,
+                headers=self.headers,
+                cookies=self.cookies,
+                timeout=AppConfig.HTTP_REQUEST_TIMEOUT,
             )
             response.raise_for_status()
             project_data: dict = response.json()
+            save_project_metadata(
+                ProjectMetadata(
+                    id=project_data["id"],
+                    path=path,
+                    topics=project_data["categories"],
+                )
+            )
 
             if _CATEGORY not in project_data["categories"]:
                 return None
@@ -85,5 +113,52 @@ class SharinghubClient(ProjectClient):
                 return None
             raise
 
+    def list_projects(self) -> list[ProjectInfo] | None:
+        """Retrieve all the projects readable by the user.
+
+        Returns None if the listing is not available or was truncated
+        (more than PROJECT_PREFETCH_MAX_PAGES pages). The STAC items must
+        expose the user access level in their properties.
+        """
+        url: str | None = (
+            f"{self.stac_search_url}?collections={_CATEGORY}&limit={_PER_PAGE}"
+        )
+        projects = []
+        for _ in range(AppConfig.PROJECT_PREFETCH_MAX_PAGES):
+            response = self.session.get(
+                url=url,
+                headers=self.headers,
+                cookies=self.cookies,
+                timeout=AppConfig.HTTP_REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            search_data: dict = response.json()
+            for feature in search_data.get("features", []):
+                properties = feature.get("properties", {})
+                if _STAC_ACCESS_LEVEL_PROPERTY not in properties:
+                    return None
+                if feature.get("collection") != _CATEGORY:
+                    continue
+                projects.append(
+                    ProjectInfo(
+                        id=properties.get(_STAC_ID_PROPERTY, 0),
+                        path=feature["id"],
+                        role=_ACCESS_LEVEL_MAPPING.get(
+                            properties[_STAC_ACCESS_LEVEL_PROPERTY], NO_ACCESS
+                        ),
+                    )
+                )
+            url = next(
+                (
+                    link["href"]
+                    for link in search_data.get("links", [])
+                    if link.get("rel") == "next"
+                ),
+                None,
+            )
+            if not url:
+                return projects
+        return None
+
     def _resolve_check_url(self, stac_id: str) -> str:
         return f"{self.checker_url}/{stac_id}?info=true"
@@ -17,7 +17,6 @@
 """Config module."""
 
 import os
-import secrets
 
 from cachelib import FileSystemCache
 from dotenv import load_dotenv
@@ -28,21 +27,64 @@ load_dotenv()
 class AppConfig:
     """Flask app config object."""
 
-    # Flask conf
-    SECRET_KEY = os.getenv("SECRET_KEY", secrets.token_hex(16))
+    # Flask conf, the key must be shared by all the workers and replicas
+    SECRET_KEY = os.getenv("SECRET_KEY", "")
     SESSION_COOKIE_NAME = "mlflow-session"
     PERMANENT_SESSION_LIFETIME = int(os.getenv("PERMANENT_SESSION_LIFETIME", "7200"))
     SESSION_TYPE = "cachelib"
     SESSION_SERIALIZATION_FORMAT = "json"
     SESSION_CACHELIB = FileSystemCache(threshold=500, cache_dir="_sessions")
+    # HTTP conf
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+    HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))
+    HTTP_REQUEST_TIMEOUT = float(os.getenv("HTTP_REQUEST_TIMEOUT", "30"))
+    HTTP_AUTH_REQUEST_TIMEOUT = float(os.getenv("HTTP_AUTH_REQUEST_TIMEOUT", "10"))
+    HTTP_BREAKER_THRESHOLD = int(os.getenv("HTTP_BREAKER_THRESHOLD", "5"))
+    HTTP_BREAKER_COOLDOWN = float(os.getenv("HTTP_BREAKER_COOLDOWN", "30"))
+    # Cache conf
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower().strip()
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_REDIS_PREFIX = os.getenv("CACHE_REDIS_PREFIX", "mlflow-sharinghub:")
+    CACHE_REDIS_TIMEOUT = float(os.getenv("CACHE_REDIS_TIMEOUT", "1"))
+    CACHE_REDIS_ENTRY_TIMEOUT = float(os.getenv("CACHE_REDIS_ENTRY_TIMEOUT", "86400"))
     # Project conf
     PROJECT_CACHE_TIMEOUT = float(os.getenv("PROJECT_CACHE_TIMEOUT", "30"))
+    PROJECT_CACHE_SIZE = int(os.getenv("PROJECT_CACHE_SIZE", "10000"))
+    PROJECT_CACHE_GRACE = float(
+        os.getenv("PROJECT_CACHE_GRACE", str(PROJECT_CACHE_TIMEOUT))
+    )
+    PROJECT_CACHE_REFRESH_AHEAD = float(os.getenv("PROJECT_CACHE_REFRESH_AHEAD", "0.8"))
+    PROJECT_CACHE_SHM_PATH = os.getenv("PROJECT_CACHE_SHM_PATH", None)
+    PROJECT_METADATA_CACHE_TIMEOUT = float(
+        os.getenv("PROJECT_METADATA_CACHE_TIMEOUT", "3600")
+    )
     PROJECT_TAG = os.getenv("PROJECT_TAG", "project")
+    PROJECT_PREFETCH = os.getenv("PROJECT_PREFETCH", "true").lower().strip() in [
+        "1",
+        "true",
+    ]
+    PROJECT_PREFETCH_MAX_PAGES = int(os.getenv("PROJECT_PREFETCH_MAX_PAGES", "10"))
+    PROJECT_LOOKUP_WORKERS = int(os.getenv("PROJECT_LOOKUP_WORKERS", "8"))
+    # Store conf
+    RUN_CACHE_SIZE = int(os.getenv("RUN_CACHE_SIZE", "100000"))
+    ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "10000"))
+    ENTITY_NAME_CACHE_TIMEOUT = float(os.getenv("ENTITY_NAME_CACHE_TIMEOUT", "30"))
+    PROJECT_TABLE = os.getenv("PROJECT_TABLE", "false").lower().strip() in [
+        "1",
+        "true",
+    ]
+    # Search conf
+    SEARCH_MAX_SCANNED_ROWS = int(os.getenv("SEARCH_MAX_SCANNED_ROWS", "10000"))
+    SEARCH_STREAM_MIN_RESULTS = int(os.getenv("SEARCH_STREAM_MIN_RESULTS", "5000"))
+    SEARCH_STREAM_BATCH_SIZE = int(os.getenv("SEARCH_STREAM_BATCH_SIZE", "1000"))
     # Auth conf
     LOGIN_AUTO_REDIRECT = os.getenv("LOGIN_AUTO_REDIRECT", "false").lower().strip() in [
         "1",
         "true",
     ]
+    AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+    AUTH_DECISION_CACHE_TIMEOUT = float(os.getenv("AUTH_DECISION_CACHE_TIMEOUT", "5"))
     # SharingHub conf
     SHARINGHUB_URL = os.getenv("SHARINGHUB_URL", None)
     SHARINGHUB_SESSION_COOKIE = os.getenv(
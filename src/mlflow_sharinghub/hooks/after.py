@@ -24,16 +24,26 @@ import requests
 from flask import Response, request
 from mlflow.protos.model_registry_pb2 import (
     CreateRegisteredModel,
+    DeleteRegisteredModel,
+    RenameRegisteredModel,
     SearchModelVersions,
     SearchRegisteredModels,
 )
-from mlflow.protos.service_pb2 import CreateExperiment, SearchExperiments, SearchRuns
+from mlflow.protos.service_pb2 import (
+    CreateExperiment,
+    DeleteExperiment,
+    DeleteRun,
+    RestoreExperiment,
+    SearchExperiments,
+    SearchRuns,
+    UpdateExperiment,
+)
 from mlflow.server.handlers import catch_mlflow_exception, get_endpoints
 
 from mlflow_sharinghub.auth.api import make_unauthorized_response
 from mlflow_sharinghub.utils.http import HTTP_UNAUTHORIZED, is_error
 
-from .handlers import filters, initializers, patch
+from .handlers import filters, initializers, invalidators, patch
 
 MAIN_JS_FILE_PATH = re.compile(r"/static-files/static/js/main.[a-z0-9]+.js")
 
@@ -44,8 +54,15 @@ AFTER_REQUEST_PATH_HANDLERS = {
     SearchRegisteredModels: filters.search_registered_models,
     SearchModelVersions: filters.search_models_versions,
     # Creation initializers
-    CreateExperiment: initializers.set_experiment_project_tag,
-    CreateRegisteredModel: initializers.set_registered_model_project_tag,
+    CreateExperiment: initializers.index_created_experiment,
+    CreateRegisteredModel: initializers.index_created_registered_model,
+    # Cache invalidators and projects table sync
+    DeleteRun: invalidators.forget_deleted_run,
+    DeleteExperiment: invalidators.forget_changed_experiment,
+    RestoreExperiment: invalidators.forget_changed_experiment,
+    UpdateExperiment: invalidators.forget_updated_experiment,
+    DeleteRegisteredModel: invalidators.forget_deleted_registered_model,
+    RenameRegisteredModel: invalidators.forget_renamed_registered_model,
 }
 
 
@@ -35,6 +35,8 @@ from mlflow.protos.model_registry_pb2 import (
     GetModelVersionDownloadUri,
     GetRegisteredModel,
     RenameRegisteredModel,
+    SearchModelVersions,
+    SearchRegisteredModels,
     SetModelVersionTag,
     SetRegisteredModelAlias,
     SetRegisteredModelTag,
@@ -59,6 +61,8 @@ from mlflow.protos.service_pb2 import (
     LogParam,
     RestoreExperiment,
     RestoreRun,
+    SearchExperiments,
+    SearchRuns,
     SetExperimentTag,
     SetTag,
     UpdateExperiment,
@@ -73,7 +77,7 @@ from mlflow_sharinghub._internal.server import (
 from mlflow_sharinghub.auth import is_authenticated, make_unauthorized_response
 from mlflow_sharinghub.utils.http import HTTP_UNAUTHORIZED, make_forbidden_response
 
-from .handlers import validators
+from .handlers import rewriters, streams, validators
 
 BEFORE_REQUEST_HANDLERS = {
     # Routes for experiments
@@ -132,6 +136,31 @@ BEFORE_REQUEST_VALIDATORS = {
 }
 
 
+BEFORE_REQUEST_REWRITE_HANDLERS = {
+    # Creation project tag
+    CreateExperiment: rewriters.set_project_tag,
+    CreateRegisteredModel: rewriters.set_project_tag,
+    # Search page tokens and push-down filters
+    SearchExperiments: rewriters.search_experiments,
+    SearchRuns: streams.search_runs,
+    SearchRegisteredModels: rewriters.search_registered_models,
+    SearchModelVersions: rewriters.search_models_versions,
+}
+
+
+def _get_before_request_rewriter(
+    request_class: Any,
+) -> Callable[[], Response | None] | None:
+    return BEFORE_REQUEST_REWRITE_HANDLERS.get(request_class)
+
+
+BEFORE_REQUEST_REWRITERS = {
+    (http_path, method): handler
+    for http_path, handler, methods in get_endpoints(_get_before_request_rewriter)
+    for method in methods
+}
+
+
 def _get_proxy_artifact_validator(
     method: str, view_args: dict[str, Any] | None
 ) -> Callable[[], bool] | None:
@@ -155,7 +184,9 @@ def before_request_hook() -> Response | None:
         return make_unauthorized_response()
 
     try:
-        return _request_validate()
+        if (resp := _request_validate()) is not None:
+            return resp
+        return _request_rewrite()
     except requests.HTTPError as err:
         if err.response.status_code == HTTP_UNAUTHORIZED:
             return make_unauthorized_response()
@@ -171,3 +202,9 @@ def _request_validate() -> Response | None:
         if validator and not validator():
             return make_forbidden_response()
     return None
+
+
+def _request_rewrite() -> Response | None:
+    if rewriter := BEFORE_REQUEST_REWRITERS.get((request.path, request.method)):
+        return rewriter()
+    return None
@@ -16,85 +16,271 @@
 
 """Filters module."""
 
-from collections.abc import Callable
+import json
+import logging
+from collections.abc import Callable, Iterator
+from functools import partial
+from math import ceil
 from typing import Any
 
-from flask import Response
+from flask import Response, request
 from mlflow.entities import Experiment, Run
 from mlflow.entities.model_registry import ModelVersion, RegisteredModel
 from mlflow.protos.model_registry_pb2 import SearchModelVersions, SearchRegisteredModels
 from mlflow.protos.service_pb2 import SearchExperiments, SearchRuns
 from mlflow.server.handlers import _get_request_message
 from mlflow.store.entities import PagedList
-from mlflow.utils.proto_json_utils import message_to_json, parse_dict
+from mlflow.store.model_registry import (
+    SEARCH_MODEL_VERSION_MAX_RESULTS_THRESHOLD,
+    SEARCH_REGISTERED_MODEL_MAX_RESULTS_THRESHOLD,
+)
+from mlflow.store.tracking import SEARCH_MAX_RESULTS_THRESHOLD
+from mlflow.utils.proto_json_utils import message_to_json
 from mlflow.utils.search_utils import SearchUtils
 
 from mlflow_sharinghub._internal.store import (
-    get_experiment_by_name,
+    get_experiment_project_path,
     get_model_registry_store,
+    get_runs_experiment_ids,
     get_tracking_store,
 )
+from mlflow_sharinghub.auth import get_request_username
+from mlflow_sharinghub.config import AppConfig
+from mlflow_sharinghub.permissions import get_permissions_for_project_tags
+from mlflow_sharinghub.utils.stats import KeyedCounter
+
+from .rewriters import is_search_scoped, sign_search_page_token
+
+_REFETCH_GROWTH = 2
+
+_logger = logging.getLogger(__name__)
+
+# Rows read from the store by the searches of each user
+_scanned_rows = KeyedCounter("search_scanned_rows", maxsize=AppConfig.AUTH_CACHE_SIZE)
+
+
+class SearchScan:
+    """Scan of search results, filtered on the user read permission.
+
+    Iterating yields the readable entities of each batch of rows, refetched
+    from the store until the page is full, the results are exhausted or
+    `max_scanned_rows` rows are scanned. The batches grow with the
+    unreadable ratio observed. Then `page_token` is the backend token of the
+    next page, from the last consumed row.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        entities: list[dict[str, Any]],
+        page_token: str,
+        next_page_token: str,
+        refetch: Callable[[str, int], PagedList[Any]],
+        get_project_tags: Callable[[list[dict[str, Any]]], list[str]],
+        max_results: int,
+        max_batch_size: int | None = None,
+        max_scanned_rows: int | None = None,
+    ) -> None:
+        """SearchScan constructor.
+
+        Args:
+            entities: First batch of rows, as JSON dicts.
+            page_token: Backend token the first batch was read from.
+            next_page_token: Backend token following the first batch.
+            refetch: Read a batch of rows from a token and a batch size.
+            get_project_tags: Read the project tag of each row.
+            max_results: Size of the page.
+            max_batch_size: Bound of the refetched batches size.
+            max_scanned_rows: Bound of the rows scanned for the page, None
+                for no bound.
+        """
+        self._entities = entities
+        self._start_token = page_token
+        self._next_page_token = next_page_token
+        self._refetch = refetch
+        self._get_project_tags = get_project_tags
+        self._max_results = max_results
+        self._max_batch_size = max_batch_size
+        self._max_scanned_rows = max_scanned_rows
+        self.page_token = next_page_token
+        self.scanned = 0
+
+    def __iter__(self) -> Iterator[list[dict[str, Any]]]:
+        entities = self._entities
+        start_token, batch_token = self._start_token, self._next_page_token
+        kept = readable_count = 0
+        batch_size = self._max_results
+        while True:
+            readable_mask = _get_readable_mask(entities, self._get_project_tags)
+            self.scanned += len(entities)
+            readable_count += sum(readable_mask)
+
+            # consume rows until the page is full
+            consumed = 0
+            chunk = []
+            for entity, readable in zip(entities, readable_mask, strict=True):
+                if kept == self._max_results:
+                    break
+                consumed += 1
+                if readable:
+                    chunk.append(entity)
+                    kept += 1
+            if chunk:
+                yield chunk
+
+            # recalculate next page token, from the last consumed row
+            if consumed == len(entities):
+                self.page_token = batch_token
+            else:
+                start_offset = SearchUtils.parse_start_offset_from_page_token(
+                    start_token
+                )
+                self.page_token = SearchUtils.create_page_token(start_offset + consumed)
+
+            if kept == self._max_results or not self.page_token or is_search_scoped():
+                break
+            if (
+                self._max_scanned_rows is not None
+                and self.scanned >= self._max_scanned_rows
+            ):
+                _logger.warning(
+                    "Search %s by %s stopped after scanning %d rows",
+                    request.path,
+                    get_request_username(),
+                    self.scanned,
+                )
+                break
+
+            batch_size = self._bound_batch_size(
+                _next_batch_size(
+                    self._max_results - kept, self.scanned, readable_count, batch_size
+                )
+            )
+            start_token = self.page_token
+            batch = self._refetch(start_token, batch_size)
+            entities = [to_json_dict(e) for e in batch]
+            batch_token = batch.token or ""
+
+        username = get_request_username()
+        _scanned_rows.add(username, self.scanned)
+        _logger.debug(
+            "Search %s by %s scanned %d rows", request.path, username, self.scanned
+        )
 
-from . import validators
+    def _bound_batch_size(self, batch_size: int) -> int:
+        if self._max_scanned_rows is not None:
+            batch_size = min(batch_size, self._max_scanned_rows - self.scanned)
+        if self._max_batch_size is not None:
+            batch_size = min(batch_size, self._max_batch_size)
+        return batch_size
 
 
 def _filter_entities(
     resp: Response,
     search_view: Any,
     search_entities_attr: str,
-    search_refetch: Callable[[Any, Any], PagedList[Any]],
-    validate: Callable[[Any], bool],
+    search_refetch: Callable[[Any, str, int], PagedList[Any]],
+    get_project_tags: Callable[[list[dict[str, Any]]], list[str]],
 ) -> None:
-    response_message = search_view.Response()
-    parse_dict(resp.json, response_message)
+    response_data = resp.get_json()
+    request_message = _get_request_message(search_view())
+    scan = SearchScan(
+        entities=response_data.get(search_entities_attr, []),
+        page_token=request_message.page_token,
+        next_page_token=response_data.get("next_page_token", ""),
+        refetch=partial(search_refetch, request_message),
+        get_project_tags=get_project_tags,
+        max_results=request_message.max_results,
+        max_scanned_rows=AppConfig.SEARCH_MAX_SCANNED_ROWS,
+    )
+    readable_entities = [entity for chunk in scan for entity in chunk]
+
+    # empty fields are omitted, like protobuf JSON serialization does
+    filtered_data = {}
+    if readable_entities:
+        filtered_data[search_entities_attr] = readable_entities
+    if scan.page_token:
+        filtered_data["next_page_token"] = sign_search_page_token(
+            search_view, scan.page_token
+        )
+    resp.data = json.dumps(filtered_data, separators=(",", ":"))
 
-    resp_entities = getattr(response_message, search_entities_attr)
 
-    # filter out unreadable
-    for e in list(resp_entities):
-        if not validate(e):
-            resp_entities.remove(e)
+def scan_runs(request_message: Any, max_batch_size: int) -> SearchScan:
+    """Start the scan of the SearchRuns results, the first batch is read now.
 
-    request_message = _get_request_message(search_view())
-    while (
-        len(resp_entities) < request_message.max_results
-        and response_message.next_page_token != ""
-    ):
-        refetched = search_refetch(request_message, response_message)
-        refetched = refetched[: request_message.max_results - len(resp_entities)]
-        if len(refetched) == 0:
-            response_message.next_page_token = ""
-            break
-
-        refetched_readable_proto = [e.to_proto() for e in refetched if validate(e.name)]
-        resp_entities.extend(refetched_readable_proto)
-
-        # recalculate next page token
-        start_offset = SearchUtils.parse_start_offset_from_page_token(
-            response_message.next_page_token
-        )
-        final_offset = start_offset + len(refetched)
-        response_message.next_page_token = SearchUtils.create_page_token(final_offset)
+    The scan is not bounded by SEARCH_MAX_SCANNED_ROWS: it is streamed, in
+    batches of at most max_batch_size rows, until the page is full.
+    """
+    first_batch = _search_refetch_runs(
+        request_message,
+        request_message.page_token,
+        min(max_batch_size, request_message.max_results),
+    )
+    return SearchScan(
+        entities=[to_json_dict(e) for e in first_batch],
+        page_token=request_message.page_token,
+        next_page_token=first_batch.token or "",
+        refetch=partial(_search_refetch_runs, request_message),
+        get_project_tags=_get_runs_project_tags,
+        max_results=request_message.max_results,
+        max_batch_size=max_batch_size,
+    )
+
+
+def _next_batch_size(gap: int, scanned: int, readable: int, previous: int) -> int:
+    """Estimate the rows to refetch to fill the gap.
+
+    The batch grows geometrically, bounded by the estimate computed from the
+    readable ratio observed so far.
+    """
+    grown = previous * _REFETCH_GROWTH
+    if readable == 0:
+        return grown
+    return max(gap, min(ceil(gap * scanned / readable), grown))
+
+
+def _get_readable_mask(
+    entities: list[dict[str, Any]],
+    get_project_tags: Callable[[list[dict[str, Any]]], list[str]],
+) -> list[bool]:
+    """Flag readable entities, each distinct project is resolved once."""
+    project_tags = get_project_tags(entities)
+    permissions = get_permissions_for_project_tags(project_tags)
+    return [permissions[tag].can_read for tag in project_tags]
 
-    resp.data = message_to_json(response_message)
 
+def to_json_dict(entity: Any) -> dict[str, Any]:
+    """Serialize a store entity like MLflow serializes the search responses."""
+    return json.loads(message_to_json(entity.to_proto()))
 
-def _search_refetch_experiments(req_msg: Any, resp_msg: Any) -> PagedList[Experiment]:
+
+def _get_tags_project_tags(entities: list[dict[str, Any]]) -> list[str]:
+    """Read project tags from the entities tags, without store round-trip."""
+    return [
+        next(
+            (
+                t.get("value", "")
+                for t in entity.get("tags", [])
+                if t.get("key") == AppConfig.PROJECT_TAG
+            ),
+            "",
+        )
+        for entity in entities
+    ]
+
+
+def _search_refetch_experiments(
+    req_msg: Any, page_token: str, max_results: int
+) -> PagedList[Experiment]:
     return get_tracking_store().search_experiments(
         view_type=req_msg.view_type,
-        max_results=req_msg.max_results,
+        max_results=min(max_results, SEARCH_MAX_RESULTS_THRESHOLD),
         order_by=req_msg.order_by,
         filter_string=req_msg.filter,
-        page_token=resp_msg.next_page_token,
+        page_token=page_token,
     )
 
 
-def _validate_experiment(experiment: Any) -> bool:
-    return validators.get_permission_for_experiment(
-        get_experiment_by_name(experiment.name)
-    ).can_read
-
-
 def search_experiments(resp: Response) -> None:
     """Patch SearchExperiments view."""
     _filter_entities(
@@ -102,55 +288,62 @@ def search_experiments(resp: Response) -> None:
         search_view=SearchExperiments,
         search_entities_attr="experiments",
         search_refetch=_search_refetch_experiments,
-        validate=_validate_experiment,
+        get_project_tags=_get_tags_project_tags,
     )
 
 
-def _search_refetch_runs(req_msg: Any, resp_msg: Any) -> PagedList[Run]:
+def _search_refetch_runs(
+    req_msg: Any, page_token: str, max_results: int
+) -> PagedList[Run]:
     return get_tracking_store().search_runs(
         experiment_ids=req_msg.experiment_ids,
         filter_string=req_msg.filter,
         run_view_type=req_msg.run_view_type,
-        max_results=req_msg.max_results,
+        max_results=min(max_results, SEARCH_MAX_RESULTS_THRESHOLD),
         order_by=req_msg.order_by,
-        page_token=resp_msg.next_page_token,
+        page_token=page_token,
     )
 
 
-def _validate_run(run: Any) -> bool:
-    return validators.get_permission_for_experiment(
-        get_tracking_store().get_experiment(run.info.experiment_id)
-    ).can_read
+def _get_runs_project_tags(runs: list[dict[str, Any]]) -> list[str]:
+    return _get_experiment_ids_project_tags(
+        [run.get("info", {}).get("experiment_id") for run in runs]
+    )
+
+
+def _get_experiment_ids_project_tags(experiment_ids: list[str | None]) -> list[str]:
+    project_tags = {
+        experiment_id: get_experiment_project_path(experiment_id)
+        for experiment_id in set(experiment_ids)
+        if experiment_id is not None
+    }
+    return [project_tags.get(experiment_id, "") for experiment_id in experiment_ids]
 
 
 def search_runs(resp: Response) -> None:
     """Patch SearchRuns view."""
+    if resp.is_streamed:
+        return  # filtered while streamed
     _filter_entities(
         resp=resp,
         search_view=SearchRuns,
         search_entities_attr="runs",
         search_refetch=_search_refetch_runs,
-        validate=_validate_run,
+        get_project_tags=_get_runs_project_tags,
     )
 
 
 def _search_refetch_registered_models(
-    req_msg: Any, resp_msg: Any
+    req_msg: Any, page_token: str, max_results: int
 ) -> PagedList[RegisteredModel]:
     return get_model_registry_store().search_registered_models(
         filter_string=req_msg.filter,
-        max_results=req_msg.max_results,
+        max_results=min(max_results, SEARCH_REGISTERED_MODEL_MAX_RESULTS_THRESHOLD),
         order_by=req_msg.order_by,
-        page_token=resp_msg.next_page_token,
+        page_token=page_token,
     )
 
 
-def _validate_registered_model(registered_model: Any) -> bool:
-    return validators.get_permission_for_registered_model(
-        get_model_registry_store().get_registered_model(registered_model.name)
-    ).can_read
-
-
 def search_registered_models(resp: Response) -> None:
     """Patch SearchRegisteredModels view."""
     _filter_entities(
@@ -158,33 +351,29 @@ def search_registered_models(resp: Response) -> None:
         search_view=SearchRegisteredModels,
         search_entities_attr="registered_models",
         search_refetch=_search_refetch_registered_models,
-        validate=_validate_registered_model,
+        get_project_tags=_get_tags_project_tags,
     )
 
 
 def _search_refetch_models_versions(
-    req_msg: Any, resp_msg: Any
+    req_msg: Any, page_token: str, max_results: int
 ) -> PagedList[ModelVersion]:
     return get_model_registry_store().search_model_versions(
         filter_string=req_msg.filter,
-        max_results=req_msg.max_results,
+        max_results=min(max_results, SEARCH_MODEL_VERSION_MAX_RESULTS_THRESHOLD),
         order_by=req_msg.order_by,
-        page_token=resp_msg.next_page_token,
+        page_token=page_token,
     )
 
 
-def _validate_model_version(model_version: Any) -> bool:
-    _tracking_store = get_tracking_store()
-    _model_registry_store = get_model_registry_store()
-    return validators.get_permission_for_experiment(
-        _tracking_store.get_experiment(
-            _tracking_store.get_run(
-                _model_registry_store.get_model_version(
-                    model_version.name, model_version.version
-                ).run_id
-            ).info.experiment_id
-        )
-    ).can_read
+def _get_models_versions_project_tags(
+    model_versions: list[dict[str, Any]],
+) -> list[str]:
+    run_ids = [mv.get("run_id", "") for mv in model_versions]
+    runs_experiment_id = get_runs_experiment_ids(run_ids)
+    return _get_experiment_ids_project_tags(
+        [runs_experiment_id.get(run_id) for run_id in run_ids]
+    )
 
 
 def search_models_versions(resp: Response) -> None:
@@ -194,5 +383,5 @@ def search_models_versions(resp: Response) -> None:
         search_view=SearchModelVersions,
         search_entities_attr="model_versions",
         search_refetch=_search_refetch_models_versions,
-        validate=_validate_model_version,
+        get_project_tags=_get_models_versions_project_tags,
     )
@@ -17,33 +17,38 @@
 """Initializers module."""
 
 from flask import Response, request
-from mlflow.entities import ExperimentTag
-from mlflow.entities.model_registry import RegisteredModelTag
 from mlflow.protos.model_registry_pb2 import CreateRegisteredModel
 from mlflow.protos.service_pb2 import CreateExperiment
 from mlflow.utils.proto_json_utils import parse_dict
 
 from mlflow_sharinghub._internal.server import get_project_path
 from mlflow_sharinghub._internal.store import (
-    get_model_registry_store,
-    get_tracking_store,
+    index_experiment,
+    index_registered_model,
+    save_experiment_project,
+    save_registered_model_project,
 )
-from mlflow_sharinghub.config import AppConfig
 
 
-def set_experiment_project_tag(resp: Response) -> None:
-    """Set the experiment project tag after CreateExperiment."""
+def index_created_experiment(resp: Response) -> None:
+    """Index the experiment project after CreateExperiment.
+
+    The project tag itself is set in the creation request (see rewriters).
+    """
     response_message = CreateExperiment.Response()
     parse_dict(resp.json, response_message)
     experiment_id = response_message.experiment_id
     project_path = get_project_path()
 
-    tag = ExperimentTag(AppConfig.PROJECT_TAG, project_path)
-    get_tracking_store().set_experiment_tag(experiment_id, tag)
+    index_experiment(experiment_id, request.json["name"], project_path)
+    save_experiment_project(experiment_id, request.json["name"], project_path)
+
 
+def index_created_registered_model(resp: Response) -> None:
+    """Index the registered model project after CreateRegisteredModel.
 
-def set_registered_model_project_tag(resp: Response) -> None:
-    """Set the registered model project tag after CreateRegisteredModel."""
+    The project tag itself is set in the creation request (see rewriters).
+    """
     response_message = CreateRegisteredModel.Response()
     parse_dict(resp.json, response_message)
     name = (
@@ -53,5 +58,5 @@ def set_registered_model_project_tag(resp: Response) -> None:
     )
     project_path = get_project_path()
 
-    tag = RegisteredModelTag(AppConfig.PROJECT_TAG, project_path)
-    get_model_registry_store().set_registered_model_tag(name, tag)
+    index_registered_model(name, project_path)
+    save_registered_model_project(name, project_path)
@@ -0,0 +1,67 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Invalidators module.
+
+Invalidators drop the cached data made stale by the request.
+"""
+
+from flask import Response
+
+from mlflow_sharinghub._internal.server import get_request_param
+from mlflow_sharinghub._internal.store import (
+    delete_registered_model_project,
+    forget_experiment,
+    forget_registered_model,
+    forget_run,
+    get_registered_model_project_path,
+    save_registered_model_project,
+    sync_experiment_project,
+)
+
+
+def forget_deleted_run(_resp: Response) -> None:
+    """Drop the cached data of the run after DeleteRun."""
+    forget_run(get_request_param("run_id"))
+
+
+def forget_changed_experiment(_resp: Response) -> None:
+    """Drop the experiment from the index after its deletion or restoration."""
+    forget_experiment(get_request_param("experiment_id"))
+
+
+def forget_updated_experiment(_resp: Response) -> None:
+    """Drop the experiment from the index after its update, sync projects table."""
+    experiment_id = get_request_param("experiment_id")
+    forget_experiment(experiment_id)
+    sync_experiment_project(experiment_id)
+
+
+def forget_deleted_registered_model(_resp: Response) -> None:
+    """Drop the registered model from the index and projects table."""
+    name = get_request_param("name")
+    forget_registered_model(name)
+    delete_registered_model_project(name)
+
+
+def forget_renamed_registered_model(_resp: Response) -> None:
+    """Drop the registered model from the index, sync projects table."""
+    name = get_request_param("name")
+    new_name = get_request_param("new_name")
+    forget_registered_model(name)
+    forget_registered_model(new_name)
+    project_path = get_registered_model_project_path(new_name)
+    save_registered_model_project(new_name, project_path, old_name=name)
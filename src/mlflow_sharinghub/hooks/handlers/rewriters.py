@@ -0,0 +1,232 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Rewriters module.
+
+Rewriters run before MLflow handles the request, they can alter the
+request or answer it directly.
+"""
+
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from flask import Response, g
+from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import INVALID_PARAMETER_VALUE
+from mlflow.protos.model_registry_pb2 import SearchModelVersions, SearchRegisteredModels
+from mlflow.protos.service_pb2 import SearchExperiments
+from mlflow.server.handlers import _get_request_message
+from mlflow.store.entities import PagedList
+from mlflow.utils.proto_json_utils import message_to_json
+
+from mlflow_sharinghub._internal.server import (
+    get_project_path,
+    get_request_params,
+    set_request_param,
+)
+from mlflow_sharinghub._internal.store import (
+    can_search_experiments_in_projects,
+    can_search_registered_models_in_projects,
+    search_experiments_in_projects,
+    search_registered_models_in_projects,
+)
+from mlflow_sharinghub.auth import get_request_auth
+from mlflow_sharinghub.config import AppConfig
+from mlflow_sharinghub.permissions import get_readable_project_paths
+from mlflow_sharinghub.utils.cache import hash_key
+from mlflow_sharinghub.utils.page_token import sign_page_token, verify_page_token
+
+_SEARCH_SCOPE_KEY = "sharinghub_search_scope"
+_SEARCH_DIGEST_KEY = "sharinghub_search_digest"
+
+# Search modes, the store page token offsets are relative to the mode
+_SCOPED_MODE = "scoped"  # answered by the store restricted to readable projects
+_FILTERED_MODE = "filtered"  # answered by MLflow, then post-filtered
+
+
+def _add_search_filter(clause: str) -> None:
+    """AND the clause into the search request filter."""
+    filter_string = get_request_params().get("filter") or ""
+    if filter_string.strip():
+        clause = f"{filter_string} AND {clause}"
+    set_request_param("filter", clause)
+
+
+def _project_tag_clause(project_path: str) -> str:
+    return f"tags.`{AppConfig.PROJECT_TAG}` = '{project_path}'"
+
+
+def scope_search_to_project() -> None:
+    """Restrict the search to the entities of the current project.
+
+    In project view, the store only returns the entities tagged with the
+    project, instead of relying on the permission post-filter.
+    """
+    project_path = get_project_path()
+    if project_path and "'" not in project_path:
+        _add_search_filter(_project_tag_clause(project_path))
+
+
+def is_search_scoped() -> bool:
+    """Assert if the search was answered already restricted to readable projects."""
+    return _get_search_scope()[0] == _SCOPED_MODE
+
+
+def _get_search_scope() -> tuple[str, str]:
+    """Return the search mode and the digest of the projects it is restricted to."""
+    return g.get(_SEARCH_SCOPE_KEY) or (_FILTERED_MODE, hash_key())
+
+
+def _set_search_scope(mode: str, project_paths: Sequence[str]) -> None:
+    g.setdefault(_SEARCH_SCOPE_KEY, (mode, hash_key(*sorted(project_paths))))
+
+
+def set_project_tag() -> None:
+    """Add the project tag to the tags of the entity to create.
+
+    The store writes the tag with the entity, in the same transaction.
+    """
+    tags = list(get_request_params().get("tags") or [])
+    tags.append({"key": AppConfig.PROJECT_TAG, "value": get_project_path()})
+    set_request_param("tags", tags)
+
+
+def get_search_digest(search_view: Any) -> str:
+    """Return the digest of the current search, computed before any rewrite."""
+    if (digest := g.get(_SEARCH_DIGEST_KEY)) is None:
+        digest = _search_digest(_get_request_message(search_view()))
+        g.setdefault(_SEARCH_DIGEST_KEY, digest)
+    return digest
+
+
+def _search_digest(request_message: Any) -> str:
+    """Digest of the user permissions scope and of the search parameters.
+
+    The page token and page size are left out, so that the user can
+    navigate with different page sizes.
+    """
+    search_message = type(request_message)()
+    search_message.CopyFrom(request_message)
+    search_message.ClearField("page_token")
+    search_message.ClearField("max_results")
+    request_auth = get_request_auth()
+    return hash_key(
+        request_auth.fingerprint if request_auth else "",
+        get_project_path(),
+        search_message.SerializeToString(deterministic=True),
+    )
+
+
+def resolve_page_token(search_view: Any) -> None:
+    """Replace the signed page token of the request by the store page token.
+
+    Page tokens of the filtered searches are signed (see filters), they
+    are only valid for the search they were issued for, answered in the
+    same mode and restricted to the same projects: a store offset is
+    meaningless otherwise.
+    """
+    request_message = _get_request_message(search_view())
+    digest = get_search_digest(search_view)
+    mode, scope = _get_search_scope()
+    if request_message.page_token:
+        try:
+            page_token = verify_page_token(
+                request_message.page_token,
+                digest,
+                AppConfig.SECRET_KEY,
+                mode=mode,
+                scope=scope,
+            )
+        except ValueError as err:
+            raise MlflowException(str(err), INVALID_PARAMETER_VALUE) from err
+        set_request_param("page_token", page_token)
+
+
+def sign_search_page_token(search_view: Any, page_token: str) -> str:
+    """Sign the store page token of the current search, see `resolve_page_token`."""
+    mode, scope = _get_search_scope()
+    return sign_page_token(
+        page_token,
+        get_search_digest(search_view),
+        AppConfig.SECRET_KEY,
+        mode=mode,
+        scope=scope,
+    )
+
+
+def search_experiments() -> Response | None:
+    """Rewrite SearchExperiments, restricted to the readable projects."""
+    return _scope_search(
+        search_view=SearchExperiments,
+        search_entities_attr="experiments",
+        search_in_projects=search_experiments_in_projects,
+        can_search_in_projects=can_search_experiments_in_projects,
+    )
+
+
+def search_registered_models() -> Response | None:
+    """Rewrite SearchRegisteredModels, restricted to the readable projects."""
+    return _scope_search(
+        search_view=SearchRegisteredModels,
+        search_entities_attr="registered_models",
+        search_in_projects=search_registered_models_in_projects,
+        can_search_in_projects=can_search_registered_models_in_projects,
+    )
+
+
+def search_models_versions() -> None:
+    """Rewrite SearchModelVersions."""
+    resolve_page_token(SearchModelVersions)
+
+
+def _scope_search(
+    search_view: Any,
+    search_entities_attr: str,
+    search_in_projects: Callable[[Sequence[str], Any, str], PagedList[Any]],
+    can_search_in_projects: Callable[[], bool],
+) -> Response | None:
+    """Restrict the search to the current project, or to readable projects.
+
+    If the projects are known and the store supports it, the search is
+    answered directly with a store-side predicate, so that pages come back
+    dense instead of post-filtered. Otherwise, in project view, the search
+    filter is restricted to the project.
+    """
+    project_path = get_project_path()
+    project_paths = [project_path] if project_path else get_readable_project_paths()
+    if project_paths is None or not can_search_in_projects():
+        if project_path:
+            _set_search_scope(_FILTERED_MODE, [project_path])
+        resolve_page_token(search_view)
+        if project_path:
+            scope_search_to_project()
+        return None
+
+    _set_search_scope(_SCOPED_MODE, project_paths)
+    resolve_page_token(search_view)
+    request_message = _get_request_message(search_view())
+    entities = search_in_projects(
+        project_paths, request_message, request_message.page_token
+    )
+    response_message = search_view.Response()
+    getattr(response_message, search_entities_attr).extend(
+        e.to_proto() for e in entities
+    )
+    if entities.token:
+        response_message.next_page_token = entities.token
+    response = Response(mimetype="application/json")
+    response.set_data(message_to_json(response_message))
+    return response
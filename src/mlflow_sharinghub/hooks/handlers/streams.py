@@ -0,0 +1,84 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streams module.
+
+Streams answer large searches directly with chunked responses, the
+entities are filtered and written out batch by batch as they are read
+from the store, so that memory stays bounded whatever the result size.
+
+The first batch is read and filtered before the response starts, so that
+its errors are answered as usual. The status is sent with it: if the store
+or the permissions resolution fails afterwards, the error is raised and the
+body is cut short, the clients fail to parse it or to read it rather than
+accepting a truncated page. Streamed scans are not bounded by
+SEARCH_MAX_SCANNED_ROWS, they run until the page is full.
+"""
+
+import json
+from collections.abc import Callable, Iterator
+from functools import partial
+from itertools import chain
+
+from flask import Response, stream_with_context
+from mlflow.protos.service_pb2 import SearchRuns
+from mlflow.server.handlers import _get_request_message
+from mlflow.store.tracking import SEARCH_MAX_RESULTS_THRESHOLD
+
+from mlflow_sharinghub.config import AppConfig
+
+from .filters import SearchScan, scan_runs
+from .rewriters import resolve_page_token, sign_search_page_token
+
+
+def search_runs() -> Response | None:
+    """Rewrite SearchRuns, large results are streamed."""
+    resolve_page_token(SearchRuns)
+    request_message = _get_request_message(SearchRuns())
+    max_results = request_message.max_results
+    if not (
+        0 < AppConfig.SEARCH_STREAM_MIN_RESULTS <= max_results
+        and max_results <= SEARCH_MAX_RESULTS_THRESHOLD
+    ):
+        return None
+
+    # first batch is read and filtered now, errors are answered as usual
+    scan = scan_runs(request_message, AppConfig.SEARCH_STREAM_BATCH_SIZE)
+    chunks = _generate_runs(scan, partial(sign_search_page_token, SearchRuns))
+    first_chunk = next(chunks)
+    return Response(
+        stream_with_context(chain([first_chunk], chunks)),
+        mimetype="application/json",
+    )
+
+
+def _generate_runs(
+    scan: SearchScan, sign_page_token: Callable[[str], str]
+) -> Iterator[str]:
+    """Generate the SearchRuns JSON response, compatible with MLflow REST schema."""
+    kept = 0
+    for chunk in scan:
+        yield ("," if kept else '{"runs":[') + ",".join(
+            json.dumps(entity, separators=(",", ":")) for entity in chunk
+        )
+        kept += len(chunk)
+
+    # empty fields are omitted, like protobuf JSON serialization does
+    end = "]" if kept else "{"
+    if scan.page_token:
+        signed_token = sign_page_token(scan.page_token)
+        end += f"{',' if kept else ''}\"next_page_token\":{json.dumps(signed_token)}"
+    yield end + "}"
@@ -17,30 +17,39 @@
 """Validators module."""
 
 import re
+from collections.abc import Callable
+from functools import wraps
 
 from flask import request
-from mlflow.entities import Experiment, Run
-from mlflow.entities.model_registry import RegisteredModel
 
 from mlflow_sharinghub._internal.server import get_project_path, get_request_param
 from mlflow_sharinghub._internal.store import (
-    get_experiment_by_name,
-    get_model_registry_store,
-    get_tracking_store,
+    get_experiment_name,
+    get_experiment_project_path,
+    get_experiment_project_path_by_name,
+    get_registered_model_project_path,
+    get_run_project_path,
 )
 from mlflow_sharinghub.auth import get_request_auth
 from mlflow_sharinghub.clients.factory import create_client
 from mlflow_sharinghub.config import AppConfig
 from mlflow_sharinghub.permissions import (
-    get_permission_for_experiment,
     get_permission_for_project,
-    get_permission_for_registered_model,
-    session_save_access_level,
+    get_permission_for_project_tag,
+    save_access_level,
 )
+from mlflow_sharinghub.utils.cache import LRUCache, hash_key
 
 _PROJECT_SUFFIX_PATTERN = re.compile(r"\s+\(.+\)$")
 _EXPERIMENT_ID_PATTERN = re.compile(r"^(\d+)/")
 
+# Short-lived run authorization decisions, for logging bursts
+_run_decisions = LRUCache[str, bool](
+    maxsize=AppConfig.AUTH_CACHE_SIZE,
+    timeout=AppConfig.AUTH_DECISION_CACHE_TIMEOUT,
+    name="run_decisions",
+)
+
 
 def _can_change_name(new_name: str, old_name: str) -> bool:
     _m = _PROJECT_SUFFIX_PATTERN.search(new_name)
@@ -50,15 +59,14 @@ def _can_change_name(new_name: str, old_name: str) -> bool:
     return new_name_suffix and new_name_suffix == old_name_suffix
 
 
-def _get_experiment_from_experiment_id_request_param() -> Experiment:
+def _get_project_path_from_experiment_id_request_param() -> str:
     experiment_id = get_request_param("experiment_id")
-    return get_tracking_store().get_experiment(experiment_id)
+    return get_experiment_project_path(experiment_id)
 
 
-def _get_experiment_from_experiment_id_artifact_proxy() -> Experiment | None:
+def _get_project_path_from_experiment_id_artifact_proxy() -> str | None:
     if experiment_id := _get_experiment_id_from_view_args():
-        experiment = get_tracking_store().get_experiment(experiment_id)
-        return experiment
+        return get_experiment_project_path(experiment_id)
     return None
 
 
@@ -69,14 +77,16 @@ def _get_experiment_id_from_view_args() -> str | None:
     return None
 
 
-def _get_run_from_run_id_request_param() -> Run:
+def _get_run_project_path_from_run_id_request_param() -> str:
     run_id = get_request_param("run_id")
-    return get_tracking_store().get_run(run_id)
+    return get_run_project_path(run_id)
 
 
-def _get_registered_model_from_registered_model_name_request_param() -> RegisteredModel:
+def _get_project_path_from_registered_model_name_request_param(
+    for_update: bool = False,
+) -> str:
     registered_model_name = get_request_param("name")
-    return get_model_registry_store().get_registered_model(registered_model_name)
+    return get_registered_model_project_path(registered_model_name, for_update)
 
 
 def can_create_for_project() -> bool:
@@ -85,14 +95,22 @@ def can_create_for_project() -> bool:
     if not project_path:
         return False
 
-    client = create_client(request_auth=get_request_auth())
+    request_auth = get_request_auth()
+    client = create_client(request_auth=request_auth)
     project = client.get_project(project_path)
     if project:
         # Will prevent sending a second request in get_permission_for_project
-        session_save_access_level(project_path, project.role)
+        save_access_level(project_path, project.role, request_auth)
     else:
         return False
 
+    if any(
+        isinstance(tag, dict) and tag.get("key") == AppConfig.PROJECT_TAG
+        for tag in request.json.get("tags") or []
+    ):
+        # Project tag is set by the server
+        return False
+
     suffix = f"({project.id})"
     if _m := _PROJECT_SUFFIX_PATTERN.search(request.json["name"]):
         if _m.group().strip() != suffix:
@@ -107,107 +125,143 @@ def can_create_for_project() -> bool:
 
 def can_read_experiment() -> bool:
     """Assert if user have read permission for experiment."""
-    experiment = _get_experiment_from_experiment_id_request_param()
-    return get_permission_for_experiment(experiment).can_read
+    project_path = _get_project_path_from_experiment_id_request_param()
+    return get_permission_for_project_tag(project_path).can_read
 
 
 def can_read_experiment_by_name() -> bool:
     """Assert if user have read permission for experiment by name."""
     experiment_name = get_request_param("experiment_name")
-    experiment = get_experiment_by_name(experiment_name)
-    return get_permission_for_experiment(experiment).can_read
+    project_path = get_experiment_project_path_by_name(experiment_name)
+    return get_permission_for_project_tag(project_path).can_read
 
 
 def can_update_experiment() -> bool:
     """Assert if user have update permission for experiment."""
-    experiment = _get_experiment_from_experiment_id_request_param()
+    experiment_id = get_request_param("experiment_id")
     if new_name := request.json.get("new_name"):  # noqa: SIM102
-        if not _can_change_name(new_name, experiment.name):
+        if not _can_change_name(new_name, get_experiment_name(experiment_id)):
             return False
-    return get_permission_for_experiment(experiment).can_update
+    project_path = get_experiment_project_path(experiment_id)
+    return get_permission_for_project_tag(project_path).can_update
 
 
 def can_update_experiment_tag() -> bool:
     """Assert if user have update permission for experiment tag."""
-    experiment = _get_experiment_from_experiment_id_request_param()
+    project_path = _get_project_path_from_experiment_id_request_param()
     tag_key = request.get_json()["key"]
     return (
         tag_key != AppConfig.PROJECT_TAG
-        and get_permission_for_experiment(experiment).can_update
+        and get_permission_for_project_tag(project_path).can_update
     )
 
 
 def can_delete_experiment() -> bool:
     """Assert if user have delete permission for experiment."""
-    experiment = _get_experiment_from_experiment_id_request_param()
-    return get_permission_for_experiment(experiment).can_delete
+    project_path = _get_project_path_from_experiment_id_request_param()
+    return get_permission_for_project_tag(project_path).can_delete
 
 
 def can_read_experiment_artifact_proxy() -> bool:
     """Assert if user have read permission for experiment artifact proxy."""
-    if experiment := _get_experiment_from_experiment_id_artifact_proxy():
-        return get_permission_for_experiment(experiment).can_read
+    if project_path := _get_project_path_from_experiment_id_artifact_proxy():
+        return get_permission_for_project_tag(project_path).can_read
     return False
 
 
 def can_update_experiment_artifact_proxy() -> bool:
     """Assert if user have update permission for experiment artifact proxy."""
-    if experiment := _get_experiment_from_experiment_id_artifact_proxy():
-        return get_permission_for_experiment(experiment).can_update
+    if project_path := _get_project_path_from_experiment_id_artifact_proxy():
+        return get_permission_for_project_tag(project_path).can_update
     return False
 
 
 def can_delete_experiment_artifact_proxy() -> bool:
     """Assert if user have delete permission for experiment artifact proxy."""
-    if experiment := _get_experiment_from_experiment_id_artifact_proxy():
-        return get_permission_for_experiment(experiment).can_delete
+    if project_path := _get_project_path_from_experiment_id_artifact_proxy():
+        return get_permission_for_project_tag(project_path).can_delete
     return False
 
 
+def _cache_run_decision(
+    action: str,
+) -> Callable[[Callable[[], bool]], Callable[[], bool]]:
+    """Cache the run validator decision, for bursts of requests on the same run.
+
+    Decisions are cached by credentials, project view, run and action, for
+    a few seconds only, as it delays permissions revocation.
+    """
+
+    def decorator(validator: Callable[[], bool]) -> Callable[[], bool]:
+        @wraps(validator)
+        def wrapper() -> bool:
+            request_auth = get_request_auth()
+            key = hash_key(
+                request_auth.fingerprint if request_auth else "",
+                get_project_path(),
+                get_request_param("run_id"),
+                action,
+            )
+            if (decision := _run_decisions.get(key)) is None:
+                decision = validator()
+                _run_decisions.set(key, decision)
+            return decision
+
+        return wrapper
+
+    return decorator
+
+
+@_cache_run_decision("read")
 def can_read_run() -> bool:
     """Assert if user have read permission for run (base on experiment)."""
-    run = _get_run_from_run_id_request_param()
-    experiment = get_tracking_store().get_experiment(run.info.experiment_id)
-    return get_permission_for_experiment(experiment).can_read
+    project_path = _get_run_project_path_from_run_id_request_param()
+    return get_permission_for_project_tag(project_path).can_read
 
 
+@_cache_run_decision("update")
 def can_update_run() -> bool:
     """Assert if user have update permission for run (base on experiment)."""
-    run = _get_run_from_run_id_request_param()
-    experiment = get_tracking_store().get_experiment(run.info.experiment_id)
-    return get_permission_for_experiment(experiment).can_update
+    project_path = _get_run_project_path_from_run_id_request_param()
+    return get_permission_for_project_tag(project_path).can_update
 
 
+@_cache_run_decision("delete")
 def can_delete_run() -> bool:
     """Assert if user have delete permission for run (base on experiment)."""
-    run = _get_run_from_run_id_request_param()
-    experiment = get_tracking_store().get_experiment(run.info.experiment_id)
-    return get_permission_for_experiment(experiment).can_delete
+    project_path = _get_run_project_path_from_run_id_request_param()
+    return get_permission_for_project_tag(project_path).can_delete
 
 
 def can_read_registered_model() -> bool:
     """Assert if user have read permission for registered model."""
-    registered_model = _get_registered_model_from_registered_model_name_request_param()
-    return get_permission_for_registered_model(registered_model).can_read
+    project_path = _get_project_path_from_registered_model_name_request_param()
+    return get_permission_for_project_tag(project_path).can_read
 
 
 def can_update_registered_model() -> bool:
     """Assert if user have update permission for registered model."""
-    registered_model = _get_registered_model_from_registered_model_name_request_param()
-    return get_permission_for_registered_model(registered_model).can_update
+    project_path = _get_project_path_from_registered_model_name_request_param(
+        for_update=True
+    )
+    return get_permission_for_project_tag(project_path).can_update
 
 
 def can_update_registered_model_tag() -> bool:
     """Assert if user have update permission for registered model tag."""
-    registered_model = _get_registered_model_from_registered_model_name_request_param()
+    project_path = _get_project_path_from_registered_model_name_request_param(
+        for_update=True
+    )
     tag_key = request.get_json()["key"]
     return (
         tag_key != AppConfig.PROJECT_TAG
-        and get_permission_for_registered_model(registered_model).can_update
+        and get_permission_for_project_tag(project_path).can_update
     )
 
 
 def can_delete_registered_model() -> bool:
     """Assert if user have delete permission for registered model."""
-    registered_model = _get_registered_model_from_registered_model_name_request_param()
-    return get_permission_for_registered_model(registered_model).can_delete
+    project_path = _get_project_path_from_registered_model_name_request_param(
+        for_update=True
+    )
+    return get_permission_for_project_tag(project_path).can_delete
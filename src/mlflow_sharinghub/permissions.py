@@ -16,15 +16,27 @@
 
 """Permissions module."""
 
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+import requests
+from mlflow import MlflowException
 from mlflow.entities import Experiment
 from mlflow.entities.model_registry import RegisteredModel
+from mlflow.protos.databricks_pb2 import TEMPORARILY_UNAVAILABLE
 
 from mlflow_sharinghub._internal.server import get_project_path
-from mlflow_sharinghub.auth import get_request_auth
+from mlflow_sharinghub.auth import RequestAuth, get_request_auth
 from mlflow_sharinghub.clients import create_client
 from mlflow_sharinghub.config import AppConfig
+from mlflow_sharinghub.utils.cache import (
+    Cache,
+    SharedMemoryCache,
+    SingleFlight,
+    create_cache,
+    hash_key,
+)
 from mlflow_sharinghub.utils.gitlab import (
     DEVELOPER,
     GUEST,
@@ -35,11 +47,58 @@ from mlflow_sharinghub.utils.gitlab import (
     REPORTER,
     GitlabRole,
 )
+from mlflow_sharinghub.utils.http import (
+    HTTP_FORBIDDEN,
+    HTTP_SERVER_ERROR,
+    HTTP_UNAUTHORIZED,
+    CircuitBreaker,
+)
 from mlflow_sharinghub.utils.session import TimedSessionStore
 
 _session_projects_access_level = TimedSessionStore[str, int](
     "projects", timeout=AppConfig.PROJECT_CACHE_TIMEOUT
 )
+# Process-wide cache, for clients that do not keep the session cookie, or
+# shared by the workers of the host in a memory-mapped table
+_projects_access_level: Cache[str, int] = (
+    SharedMemoryCache(
+        AppConfig.PROJECT_CACHE_SHM_PATH,
+        slots=AppConfig.PROJECT_CACHE_SIZE,
+        timeout=AppConfig.PROJECT_CACHE_TIMEOUT,
+        name="projects_access_level",
+        grace=AppConfig.PROJECT_CACHE_GRACE,
+        refresh_ahead=AppConfig.PROJECT_CACHE_REFRESH_AHEAD,
+    )
+    if AppConfig.PROJECT_CACHE_SHM_PATH
+    else create_cache(
+        "projects_access_level",
+        maxsize=AppConfig.PROJECT_CACHE_SIZE,
+        timeout=AppConfig.PROJECT_CACHE_TIMEOUT,
+        grace=AppConfig.PROJECT_CACHE_GRACE,
+        refresh_ahead=AppConfig.PROJECT_CACHE_REFRESH_AHEAD,
+    )
+)
+# Access levels of all the user projects, with listing availability
+_users_projects_access_level: Cache[str, tuple[bool, dict[str, int]]] = create_cache(
+    "users_projects_access_level",
+    maxsize=AppConfig.AUTH_CACHE_SIZE,
+    timeout=AppConfig.PROJECT_CACHE_TIMEOUT,
+    grace=AppConfig.PROJECT_CACHE_GRACE,
+    refresh_ahead=AppConfig.PROJECT_CACHE_REFRESH_AHEAD,
+)
+# Concurrent upstream lookups of the same key are coalesced
+_role_lookups = SingleFlight[str, tuple[GitlabRole, bool]]()
+_listings = SingleFlight[str, tuple[bool, dict[str, int]]]()
+# Fail fast when the upstream keeps failing
+_upstream_breaker = CircuitBreaker(
+    threshold=AppConfig.HTTP_BREAKER_THRESHOLD,
+    cooldown=AppConfig.HTTP_BREAKER_COOLDOWN,
+)
+# Bounded pool for concurrent upstream lookups of batch resolutions
+_lookup_executor = ThreadPoolExecutor(
+    max_workers=AppConfig.PROJECT_LOOKUP_WORKERS,
+    thread_name_prefix="sharinghub-lookup",
+)
 
 
 @dataclass(unsafe_hash=True)
@@ -95,32 +154,281 @@ def get_permission_for_registered_model(
 
 
 def _get_permission_from_tags(obj: Experiment | RegisteredModel) -> Permission:
-    project_path = get_project_path()
-    obj_project_path = obj.tags.get(AppConfig.PROJECT_TAG, "").strip()
-    if not obj_project_path or (project_path and project_path != obj_project_path):
+    return get_permission_for_project_tag(obj.tags.get(AppConfig.PROJECT_TAG, ""))
+
+
+def get_permission_for_project_tag(project_tag: str) -> Permission:
+    """Return permission for an entity tagged with the given project tag."""
+    obj_project_path = project_tag.strip()
+    if not _is_in_scope(obj_project_path):
         return _ROLES_PERMISSIONS[NO_ACCESS]
     return get_permission_for_project(obj_project_path)
 
 
+def _is_in_scope(obj_project_path: str) -> bool:
+    project_path = get_project_path()
+    return bool(obj_project_path) and (
+        not project_path or project_path == obj_project_path
+    )
+
+
+def get_permissions_for_project_tags(
+    project_tags: Iterable[str],
+) -> dict[str, Permission]:
+    """Return permission for each distinct project tag value.
+
+    Cached access levels are used first, the remaining projects are
+    resolved concurrently, once each.
+    """
+    request_auth = get_request_auth()
+    permissions = {}
+    missing = []
+    for project_tag in set(project_tags):
+        obj_project_path = project_tag.strip()
+        if not _is_in_scope(obj_project_path):
+            permissions[project_tag] = _ROLES_PERMISSIONS[NO_ACCESS]
+        elif (
+            access_level := get_access_level(obj_project_path, request_auth)
+        ) is not None:
+            permissions[project_tag] = _ROLES_PERMISSIONS[
+                GitlabRole.from_access_level(access_level)
+            ]
+        else:
+            missing.append(project_tag)
+
+    if missing:
+        if request_auth is not None:
+            # Warm the listing once, instead of once per concurrent lookup
+            prefetch_access_levels(request_auth)
+        roles = _lookup_executor.map(
+            lambda project_tag: _fetch_role(project_tag.strip(), request_auth),
+            missing,
+        )
+        for project_tag, (role, fresh) in zip(missing, roles, strict=True):
+            if fresh:
+                save_access_level(project_tag.strip(), role, request_auth)
+            permissions[project_tag] = _ROLES_PERMISSIONS[role]
+    return permissions
+
+
 def get_permission_for_project(project_path: str) -> Permission:
     """Return permission for project corresponding to given project_path."""
-    project_access_level = session_get_access_level(project_path)
+    request_auth = get_request_auth()
+    project_access_level = get_access_level(project_path, request_auth)
     if project_access_level is None:
-        request_auth = get_request_auth()
-        client = create_client(request_auth=request_auth)
-        project = client.get_project(path=project_path)
-        user_role = project.role if project else NO_ACCESS
-        session_save_access_level(project_path, user_role)
+        user_role, fresh = _fetch_role(project_path, request_auth)
+        if fresh:
+            save_access_level(project_path, user_role, request_auth)
     else:
         user_role = GitlabRole.from_access_level(project_access_level)
     return _ROLES_PERMISSIONS[user_role]
 
 
-def session_get_access_level(project_path: str) -> int | None:
-    """Get project access level in GitLab from session."""
-    return _session_projects_access_level.get(project_path)
+def _fetch_role(
+    project_path: str, request_auth: RequestAuth | None
+) -> tuple[GitlabRole, bool]:
+    """Fetch the user role, concurrent lookups of the same role are coalesced.
+
+    A recently expired role (within PROJECT_CACHE_GRACE) is served while
+    it is refreshed in background. Returns the role, and whether it is
+    fresh, a stale role or a role read from a stale listing must not be
+    saved again.
+    """
+    if request_auth is None:
+        return _lookup_role(project_path, request_auth)
+    key = _cache_key(project_path, request_auth)
+    stale_access_level = _projects_access_level.get_stale(key)
+    if stale_access_level is not None:
+        if not _role_lookups.in_flight(key):
+            _lookup_executor.submit(_refresh_role, project_path, request_auth)
+        return GitlabRole.from_access_level(stale_access_level), False
+    return _role_lookups.do(key, lambda: _lookup_role(project_path, request_auth))
+
+
+def _refresh_role(project_path: str, request_auth: RequestAuth) -> None:
+    # The cached listing may be as old as the role, the project is fetched
+    key = _cache_key(project_path, request_auth)
+    try:
+        _role_lookups.do(
+            key, lambda: _lookup_role(project_path, request_auth, use_listing=False)
+        )
+    except requests.HTTPError as err:
+        if _is_access_denied(err):
+            # The token was revoked, or the access lost, the role is dropped
+            _projects_access_level.delete(key)
+    except (requests.RequestException, MlflowException):
+        # The role is served until the end of its grace period
+        return
+
+
+def _lookup_role(
+    project_path: str, request_auth: RequestAuth | None, use_listing: bool = True
+) -> tuple[GitlabRole, bool]:
+    role, fresh = _lookup_role_upstream(project_path, request_auth, use_listing)
+    if request_auth is not None and fresh:
+        # Cached before the waiters are released, the next lookups will hit
+        _projects_access_level.set(
+            _cache_key(project_path, request_auth), role.access_level
+        )
+    return role, fresh
+
+
+def _lookup_role_upstream(
+    project_path: str, request_auth: RequestAuth | None, use_listing: bool = True
+) -> tuple[GitlabRole, bool]:
+    if request_auth is not None and use_listing:
+        projects_access_level, fresh = _prefetch_access_levels(request_auth)
+        if projects_access_level is not None:
+            # The listing is complete, projects not listed are not accessible
+            role = GitlabRole.from_access_level(
+                projects_access_level.get(project_path, NO_ACCESS.access_level)
+            )
+            return role, fresh
+    client = create_client(request_auth=request_auth)
+    project = _call_upstream(lambda: client.get_project(path=project_path))
+    return (project.role if project else NO_ACCESS), True
+
 
+def prefetch_access_levels(request_auth: RequestAuth) -> dict[str, int] | None:
+    """Return the access levels of all the projects readable by the user.
 
-def session_save_access_level(project_path: str, role: GitlabRole) -> None:
-    """Store GitLab role access level for the project in the session."""
+    The projects are listed in a few paged upstream calls, and the result
+    is cached for PROJECT_CACHE_TIMEOUT. A listing used past the
+    PROJECT_CACHE_REFRESH_AHEAD fraction of its lifespan, or recently
+    expired, is renewed in background. Returns None if the prefetch is
+    disabled or the listing is not available.
+    """
+    return _prefetch_access_levels(request_auth)[0]
+
+
+def _prefetch_access_levels(
+    request_auth: RequestAuth,
+) -> tuple[dict[str, int] | None, bool]:
+    """Return the listing of prefetch_access_levels, and whether it is fresh.
+
+    A recently expired listing is not fresh, the roles read from it are
+    only used for the current request.
+    """
+    if not AppConfig.PROJECT_PREFETCH:
+        return None, True
+    key = request_auth.fingerprint
+    fresh = True
+    cached = _users_projects_access_level.get(key)
+    if cached is not None:
+        if _users_projects_access_level.claim_refresh(key):
+            _lookup_executor.submit(_refresh_access_levels, request_auth)
+    else:
+        cached = _users_projects_access_level.get_stale(key)
+        if cached is None:
+            cached = _listings.do(key, lambda: _list_access_levels(request_auth))
+        else:
+            fresh = False
+            if not _listings.in_flight(key):
+                _lookup_executor.submit(_refresh_access_levels, request_auth)
+    available, projects_access_level = cached
+    return (projects_access_level if available else None), fresh
+
+
+def _refresh_access_levels(request_auth: RequestAuth) -> None:
+    key = request_auth.fingerprint
+    try:
+        _listings.do(key, lambda: _list_access_levels(request_auth))
+    except requests.HTTPError as err:
+        if _is_access_denied(err):
+            _users_projects_access_level.delete(key)
+    except (requests.RequestException, MlflowException):
+        # The listing is served until the end of its grace period
+        return
+
+
+def _is_access_denied(err: requests.HTTPError) -> bool:
+    return err.response is not None and err.response.status_code in (
+        HTTP_UNAUTHORIZED,
+        HTTP_FORBIDDEN,
+    )
+
+
+def _list_access_levels(request_auth: RequestAuth) -> tuple[bool, dict[str, int]]:
+    client = create_client(request_auth=request_auth)
+    projects = _call_upstream(client.list_projects)
+    listing = (
+        projects is not None,
+        {project.path: project.role.access_level for project in projects or []},
+    )
+    _users_projects_access_level.set(request_auth.fingerprint, listing)
+    return listing
+
+
+def _call_upstream[T](func: Callable[[], T]) -> T:
+    """Call upstream through the circuit breaker.
+
+    Raises:
+        mlflow.MlflowException: If the circuit is open, or the upstream
+            is unreachable or failing.
+    """
+    if not _upstream_breaker.allow():
+        msg = "Projects service unavailable"
+        raise MlflowException(msg, TEMPORARILY_UNAVAILABLE)
+    try:
+        result = func()
+    except (requests.ConnectionError, requests.Timeout) as err:
+        _upstream_breaker.record_failure()
+        msg = "Projects service unreachable"
+        raise MlflowException(msg, TEMPORARILY_UNAVAILABLE) from err
+    except requests.HTTPError as err:
+        if err.response.status_code >= HTTP_SERVER_ERROR:
+            _upstream_breaker.record_failure()
+        raise
+    _upstream_breaker.record_success()
+    return result
+
+
+def get_readable_project_paths() -> list[str] | None:
+    """Return the paths of all the projects readable by the user.
+
+    Returns None if the projects listing is not available.
+    """
+    request_auth = get_request_auth()
+    if request_auth is None:
+        return None
+    projects_access_level = prefetch_access_levels(request_auth)
+    if projects_access_level is None:
+        return None
+    return sorted(
+        project_path
+        for project_path, access_level in projects_access_level.items()
+        if _ROLES_PERMISSIONS[GitlabRole.from_access_level(access_level)].can_read
+    )
+
+
+def get_access_level(
+    project_path: str, request_auth: RequestAuth | None = None
+) -> int | None:
+    """Get project access level in GitLab from session or process cache.
+
+    An access level used past the PROJECT_CACHE_REFRESH_AHEAD fraction of
+    its lifespan is renewed in background, before it expires.
+    """
+    access_level = _session_projects_access_level.get(project_path)
+    if request_auth is not None:
+        key = _cache_key(project_path, request_auth)
+        if access_level is None:
+            access_level = _projects_access_level.get(key)
+        if access_level is not None and _projects_access_level.claim_refresh(key):
+            _lookup_executor.submit(_refresh_role, project_path, request_auth)
+    return access_level
+
+
+def save_access_level(
+    project_path: str, role: GitlabRole, request_auth: RequestAuth | None = None
+) -> None:
+    """Store GitLab role access level for the project in session and cache."""
     _session_projects_access_level.set(project_path, role.access_level)
+    if request_auth is not None:
+        _projects_access_level.set(
+            _cache_key(project_path, request_auth), role.access_level
+        )
+
+
+def _cache_key(project_path: str, request_auth: RequestAuth) -> str:
+    return hash_key(request_auth.fingerprint, project_path)
@@ -0,0 +1,680 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache module (utils).
+
+Process-wide in-memory caches, shared between sessions and threads, and
+networked caches shared between the server replicas.
+"""
+
+import fcntl
+import functools
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, Protocol
+
+from mlflow_sharinghub.config import AppConfig
+
+_logger = logging.getLogger(__name__)
+
+# Named caches, for statistics
+_caches: dict[str, "Cache"] = {}
+
+# Shared cache values are prefixed with their storage timestamp
+_TIMESTAMP = struct.Struct("!d")
+
+# Shared memory table layout: header, then fixed-size slots of
+# (sequence, key digest, storage timestamp, value, refresh claimed)
+_SHM_MAGIC = b"SHPC"
+_SHM_VERSION = 1
+_SHM_HEADER = struct.Struct("=4sIQ")
+_SHM_HEADER_SIZE = 64
+_SHM_SEQ = struct.Struct("=Q")
+_SHM_SLOT = struct.Struct("=Q16sdi?3x")
+_SHM_EMPTY_KEY = bytes(16)
+# Slots probed for a key, from its hash position
+_SHM_PROBES = 8
+_SHM_READ_RETRIES = 100
+
+
+def hash_key(*parts: object) -> str:
+    """Return a stable digest of the given parts, usable as a cache key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class Cache[K, V](Protocol):
+    """Cache interface, implemented by the cache backends."""
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Get key from cache, return default if not found or expired."""
+
+    def get_stale(self, key: K) -> V | None:
+        """Get key from cache, even if expired since less than the grace duration."""
+
+    def claim_refresh(self, key: K) -> bool:
+        """Assert if the entry is due for renewal, claiming its renewal."""
+
+    def set(self, key: K, val: V) -> None:
+        """Set val for key in cache."""
+
+    def delete(self, key: K) -> None:
+        """Remove key from cache if present."""
+
+    def clear(self) -> None:
+        """Clear cache."""
+
+    def stats(self) -> dict[str, int]:
+        """Return the cache hits and misses counters, and size if local."""
+
+
+class RedisClient(Protocol):
+    """Subset of the Redis client used by the shared caches."""
+
+    def get(self, name: str) -> bytes | None:
+        """Return the value at key name, or None."""
+
+    def set(
+        self, name: str, value: bytes, px: int | None = None, nx: bool = False
+    ) -> bool | None:
+        """Set the value at key name, expiring in px milliseconds."""
+
+    def delete(self, *names: str | bytes) -> int:
+        """Delete the keys."""
+
+    def scan_iter(self, match: str | None = None) -> Iterator[bytes]:
+        """Iterate over the keys matching the pattern."""
+
+
+class LRUCache[K, V]:
+    """Thread-safe LRU cache with optional expiration timeout."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        timeout: float | None = None,
+        name: str | None = None,
+        grace: float = 0,
+        refresh_ahead: float = 0,
+    ) -> None:
+        """LRUCache constructor.
+
+        Args:
+            maxsize: Maximum number of entries, the least recently used entry
+                     is evicted when the cache is full.
+            timeout: lifespan for the stored values, None for no expiration.
+            name: Name of the cache, named caches are listed in statistics.
+            grace: Duration after expiration during which the values can still
+                   be retrieved with `get_stale`.
+            refresh_ahead: Fraction of the timeout after which an entry is due
+                           for renewal with `claim_refresh`, 0 to disable.
+        """
+        self._maxsize = maxsize
+        self._timeout = timeout
+        self._grace = grace
+        self._refresh_ahead = refresh_ahead
+        self._lock = threading.Lock()
+        self._store: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._refreshing: set[K] = set()
+        self.hits = 0
+        self.misses = 0
+        if name:
+            _caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Get key from cache, return default if not found or expired."""
+        with self._lock:
+            item = self._store.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            dt, val = item
+            if self._timeout is not None and time.monotonic() - dt >= self._timeout:
+                self._expire(key, dt)
+                self.misses += 1
+                return default
+            self._store.move_to_end(key)
+            self.hits += 1
+            return val
+
+    def get_stale(self, key: K) -> V | None:
+        """Get key from cache, even if expired since less than the grace duration."""
+        with self._lock:
+            item = self._store.get(key)
+            if item is None:
+                return None
+            dt, val = item
+            if self._expire(key, dt):
+                return None
+            return val
+
+    def claim_refresh(self, key: K) -> bool:
+        """Assert if the entry is due for renewal, claiming its renewal.
+
+        An entry is due once older than the refresh-ahead fraction of the
+        timeout, and is claimed once until set again, so that a single
+        renewal is scheduled.
+        """
+        if not self._refresh_ahead or self._timeout is None:
+            return False
+        with self._lock:
+            item = self._store.get(key)
+            if item is None or key in self._refreshing:
+                return False
+            if time.monotonic() - item[0] < self._timeout * self._refresh_ahead:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _expire(self, key: K, dt: float) -> bool:
+        """Remove the entry if expired past the grace duration."""
+        if (
+            self._timeout is not None
+            and time.monotonic() - dt >= self._timeout + self._grace
+        ):
+            del self._store[key]
+            self._refreshing.discard(key)
+            return True
+        return False
+
+    def set(self, key: K, val: V) -> None:
+        """Set val for key in cache."""
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._store[key] = (time.monotonic(), val)
+            self._store.move_to_end(key)
+            self._refreshing.discard(key)
+            while len(self._store) > self._maxsize:
+                evicted, _ = self._store.popitem(last=False)
+                self._refreshing.discard(evicted)
+
+    def delete(self, key: K) -> None:
+        """Remove key from cache if present."""
+        with self._lock:
+            self._store.pop(key, None)
+            self._refreshing.discard(key)
+
+    def clear(self) -> None:
+        """Clear cache."""
+        with self._lock:
+            self._store.clear()
+            self._refreshing.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return the cache size, hits and misses counters."""
+        return {"size": len(self._store), "hits": self.hits, "misses": self.misses}
+
+
+class RedisCache[K, V]:
+    """Cache stored in Redis, shared between the server replicas.
+
+    Values are stored as their timestamp followed by their compact JSON
+    encoding, JSON arrays are read back as tuples. Entries are dropped by
+    Redis after the timeout and grace duration, without timeout they are
+    only dropped by the Redis eviction policy, which must then be set. The
+    backend errors are logged and handled as cache misses.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client: RedisClient,
+        name: str,
+        timeout: float | None = None,
+        grace: float = 0,
+        refresh_ahead: float = 0,
+        prefix: str = "",
+        errors: tuple[type[Exception], ...] = (),
+    ) -> None:
+        """RedisCache constructor.
+
+        Args:
+            client: Redis client.
+            name: Name of the cache, namespace of its keys.
+            timeout: lifespan for the stored values, None for no expiration.
+            grace: Duration after expiration during which the values can still
+                   be retrieved with `get_stale`.
+            refresh_ahead: Fraction of the timeout after which an entry is due
+                           for renewal with `claim_refresh`, 0 to disable.
+            prefix: Prefix of the keys, shared by the caches.
+            errors: Client errors handled as cache misses.
+        """
+        self._client = client
+        self._timeout = timeout
+        self._grace = grace
+        self._refresh_ahead = refresh_ahead
+        self._prefix = f"{prefix}{name}:"
+        self._refresh_prefix = f"{prefix}refresh:{name}:"
+        self._errors = errors
+        self.hits = 0
+        self.misses = 0
+        _caches[name] = self
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Get key from cache, return default if not found or expired."""
+        item = self._load(key)
+        if item is None or (
+            self._timeout is not None and time.time() - item[0] >= self._timeout
+        ):
+            self.misses += 1
+            return default
+        self.hits += 1
+        return item[1]
+
+    def get_stale(self, key: K) -> V | None:
+        """Get key from cache, even if expired since less than the grace duration."""
+        item = self._load(key)
+        return None if item is None else item[1]
+
+    def claim_refresh(self, key: K) -> bool:
+        """Assert if the entry is due for renewal, claiming its renewal.
+
+        The claim is shared between the replicas, a single renewal is
+        scheduled until the entry is set again.
+        """
+        if not self._refresh_ahead or self._timeout is None:
+            return False
+        item = self._load(key)
+        if item is None:
+            return False
+        age = time.time() - item[0]
+        if age < self._timeout * self._refresh_ahead:
+            return False
+        ttl = self._timeout + self._grace - age
+        return bool(
+            self._call(
+                lambda: self._client.set(
+                    f"{self._refresh_prefix}{key}", b"", px=_ms(ttl), nx=True
+                ),
+                False,
+            )
+        )
+
+    def set(self, key: K, val: V) -> None:
+        """Set val for key in cache."""
+        value = (
+            _TIMESTAMP.pack(time.time())
+            + json.dumps(val, separators=(",", ":")).encode()
+        )
+        ttl = None if self._timeout is None else _ms(self._timeout + self._grace)
+        self._call(lambda: self._client.set(f"{self._prefix}{key}", value, px=ttl))
+        self._call(lambda: self._client.delete(f"{self._refresh_prefix}{key}"))
+
+    def delete(self, key: K) -> None:
+        """Remove key from cache if present."""
+        self._call(
+            lambda: self._client.delete(
+                f"{self._prefix}{key}", f"{self._refresh_prefix}{key}"
+            )
+        )
+
+    def clear(self) -> None:
+        """Clear cache."""
+        for prefix in (self._prefix, self._refresh_prefix):
+            keys = self._call(
+                lambda prefix=prefix: list(self._client.scan_iter(match=f"{prefix}*")),
+                [],
+            )
+            if keys:
+                self._call(lambda keys=keys: self._client.delete(*keys))
+
+    def stats(self) -> dict[str, int]:
+        """Return the cache hits and misses counters.
+
+        The size is not reported, it would require to scan the keyspace.
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _load(self, key: K) -> tuple[float, V] | None:
+        value = self._call(lambda: self._client.get(f"{self._prefix}{key}"))
+        if value is None:
+            return None
+        (dt,) = _TIMESTAMP.unpack_from(value)
+        val = json.loads(value[_TIMESTAMP.size :])
+        return dt, tuple(val) if isinstance(val, list) else val
+
+    def _call(self, func: Callable[[], Any], default: Any = None) -> Any:
+        try:
+            return func()
+        except self._errors:
+            _logger.warning("Shared cache unavailable", exc_info=True)
+            return default
+
+
+def _ms(duration: float) -> int:
+    return max(1, int(duration * 1000))
+
+
+class SharedMemoryCache:
+    """Fixed-size hash table of integer values, in a memory-mapped file.
+
+    The processes mapping the same file, like the server workers, share the
+    entries. A key is stored in one of the slots following its hash position,
+    the oldest is replaced when they are all used. Reads are lock-free with a
+    sequence lock: a slot is written between two increments of its sequence,
+    and the read is retried if the sequence was odd or has changed. Writes
+    lock the probed slots between processes.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: str,
+        slots: int,
+        timeout: float | None = None,
+        name: str | None = None,
+        grace: float = 0,
+        refresh_ahead: float = 0,
+    ) -> None:
+        """SharedMemoryCache constructor.
+
+        Args:
+            path: Path of the table file, preferably in a tmpfs like /dev/shm.
+            slots: Number of entries of the table.
+            timeout: lifespan for the stored values, None for no expiration.
+            name: Name of the cache, named caches are listed in statistics.
+            grace: Duration after expiration during which the values can still
+                   be retrieved with `get_stale`.
+            refresh_ahead: Fraction of the timeout after which an entry is due
+                           for renewal with `claim_refresh`, 0 to disable.
+        """
+        self._slots = max(slots, _SHM_PROBES)
+        self._timeout = timeout
+        self._grace = grace
+        self._refresh_ahead = refresh_ahead
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        size = _SHM_HEADER_SIZE + self._slots * _SHM_SLOT.size
+        with self._locked(0, 0):
+            header = os.pread(self._fd, _SHM_HEADER.size, 0)
+            if os.fstat(self._fd).st_size != size or header != _SHM_HEADER.pack(
+                _SHM_MAGIC, _SHM_VERSION, self._slots
+            ):
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(
+                    self._fd,
+                    _SHM_HEADER.pack(_SHM_MAGIC, _SHM_VERSION, self._slots),
+                    0,
+                )
+        self._mm = mmap.mmap(self._fd, size)
+        self.hits = 0
+        self.misses = 0
+        if name:
+            _caches[name] = self
+
+    def __len__(self) -> int:
+        return sum(
+            1
+            for index in range(self._slots)
+            if (slot := self._read(index)) is not None
+            and slot[0] != _SHM_EMPTY_KEY
+            and not self._is_dropped(slot[1])
+        )
+
+    def get(self, key: str, default: int | None = None) -> int | None:
+        """Get key from cache, return default if not found or expired."""
+        slot = self._find(_digest(key))[1]
+        if slot is None or self._is_expired(slot[1]):
+            self.misses += 1
+            return default
+        self.hits += 1
+        return slot[2]
+
+    def get_stale(self, key: str) -> int | None:
+        """Get key from cache, even if expired since less than the grace duration."""
+        slot = self._find(_digest(key))[1]
+        if slot is None or self._is_dropped(slot[1]):
+            return None
+        return slot[2]
+
+    def claim_refresh(self, key: str) -> bool:
+        """Assert if the entry is due for renewal, claiming its renewal.
+
+        The claim is shared between the processes, a single renewal is
+        scheduled until the entry is set again.
+        """
+        if not self._refresh_ahead or self._timeout is None:
+            return False
+        digest = _digest(key)
+        start = self._start(digest)
+        with self._locked(*self._window(start)):
+            index, slot = self._find(digest, start)
+            if (
+                slot is None
+                or slot[3]
+                or time.time() - slot[1] < self._timeout * self._refresh_ahead
+            ):
+                return False
+            self._write(index, digest, slot[1], slot[2], claimed=True)
+            return True
+
+    def set(self, key: str, val: int) -> None:
+        """Set val for key in cache."""
+        digest = _digest(key)
+        start = self._start(digest)
+        with self._locked(*self._window(start)):
+            index = self._find(digest, start)[0]
+            if index is None:
+                index = self._free_slot(start)
+            self._write(index, digest, time.time(), val)
+
+    def delete(self, key: str) -> None:
+        """Remove key from cache if present."""
+        digest = _digest(key)
+        start = self._start(digest)
+        with self._locked(*self._window(start)):
+            index = self._find(digest, start)[0]
+            if index is not None:
+                self._write(index, _SHM_EMPTY_KEY, 0, 0)
+
+    def clear(self) -> None:
+        """Clear cache."""
+        with self._locked(_SHM_HEADER_SIZE, self._slots * _SHM_SLOT.size):
+            for index in range(self._slots):
+                self._write(index, _SHM_EMPTY_KEY, 0, 0)
+
+    def stats(self) -> dict[str, int]:
+        """Return the cache size, hits and misses counters."""
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+    def _start(self, digest: bytes) -> int:
+        # The probed slots never wrap around, to be locked as a single range
+        return int.from_bytes(digest[:8]) % (self._slots - _SHM_PROBES + 1)
+
+    def _window(self, start: int) -> tuple[int, int]:
+        return _SHM_HEADER_SIZE + start * _SHM_SLOT.size, _SHM_PROBES * _SHM_SLOT.size
+
+    def _find(
+        self, digest: bytes, start: int | None = None
+    ) -> tuple[int | None, tuple[bytes, float, int, bool] | None]:
+        if start is None:
+            start = self._start(digest)
+        for index in range(start, start + _SHM_PROBES):
+            slot = self._read(index)
+            if slot is not None and slot[0] == digest:
+                return index, slot
+        return None, None
+
+    def _free_slot(self, start: int) -> int:
+        """Return the first empty or dropped slot, else the oldest one."""
+        oldest, oldest_dt = start, float("inf")
+        for index in range(start, start + _SHM_PROBES):
+            slot = self._read(index)
+            if slot is None:
+                continue
+            if slot[0] == _SHM_EMPTY_KEY or self._is_dropped(slot[1]):
+                return index
+            if slot[1] < oldest_dt:
+                oldest, oldest_dt = index, slot[1]
+        return oldest
+
+    def _read(self, index: int) -> tuple[bytes, float, int, bool] | None:
+        offset = _SHM_HEADER_SIZE + index * _SHM_SLOT.size
+        for _ in range(_SHM_READ_RETRIES):
+            (seq,) = _SHM_SEQ.unpack_from(self._mm, offset)
+            if seq % 2:
+                continue
+            slot = _SHM_SLOT.unpack_from(self._mm, offset)
+            if _SHM_SEQ.unpack_from(self._mm, offset) == (seq,):
+                return slot[1:]
+        return None
+
+    def _write(
+        self, index: int, digest: bytes, dt: float, val: int, claimed: bool = False
+    ) -> None:
+        offset = _SHM_HEADER_SIZE + index * _SHM_SLOT.size
+        (seq,) = _SHM_SEQ.unpack_from(self._mm, offset)
+        _SHM_SEQ.pack_into(self._mm, offset, seq + 1)
+        _SHM_SLOT.pack_into(self._mm, offset, seq + 1, digest, dt, val, claimed)
+        _SHM_SEQ.pack_into(self._mm, offset, seq + 2)
+
+    def _is_expired(self, dt: float) -> bool:
+        return self._timeout is not None and time.time() - dt >= self._timeout
+
+    def _is_dropped(self, dt: float) -> bool:
+        return (
+            self._timeout is not None
+            and time.time() - dt >= self._timeout + self._grace
+        )
+
+    @contextmanager
+    def _locked(self, offset: int, length: int) -> Iterator[None]:
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, offset)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, offset)
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
+def create_cache[K, V](
+    name: str,
+    maxsize: int,
+    timeout: float | None = None,
+    grace: float = 0,
+    refresh_ahead: float = 0,
+) -> Cache[K, V]:
+    """Create a cache with the configured backend, CACHE_BACKEND.
+
+    The "memory" backend keeps the entries in the process, the "redis"
+    backend shares them between the server replicas, at CACHE_REDIS_URL.
+    Redis does not bound the number of entries, those of the caches without
+    timeout expire after CACHE_REDIS_ENTRY_TIMEOUT.
+    """
+    if AppConfig.CACHE_BACKEND == "redis":
+        client, errors = _get_redis_client()
+        return RedisCache[K, V](
+            client,
+            name=name,
+            timeout=AppConfig.CACHE_REDIS_ENTRY_TIMEOUT if timeout is None else timeout,
+            grace=grace,
+            refresh_ahead=refresh_ahead,
+            prefix=AppConfig.CACHE_REDIS_PREFIX,
+            errors=errors,
+        )
+    return LRUCache[K, V](
+        maxsize=maxsize,
+        timeout=timeout,
+        name=name,
+        grace=grace,
+        refresh_ahead=refresh_ahead,
+    )
+
+
+@functools.cache
+def _get_redis_client() -> tuple[RedisClient, tuple[type[Exception], ...]]:
+    import redis
+
+    client = redis.Redis.from_url(
+        AppConfig.CACHE_REDIS_URL,
+        socket_timeout=AppConfig.CACHE_REDIS_TIMEOUT,
+        socket_connect_timeout=AppConfig.CACHE_REDIS_TIMEOUT,
+    )
+    return client, (redis.RedisError,)
+
+
+def get_caches_stats() -> dict[str, dict[str, int]]:
+    """Return the statistics of the named caches."""
+    return {name: cache.stats() for name, cache in sorted(_caches.items())}
+
+
+class _Flight[V]:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: V | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight[K, V]:
+    """Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller executes the function, the concurrent callers for the
+    same key wait for its result (or its error). Relies on `threading`
+    primitives, which gevent monkey-patching makes cooperative.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[K, _Flight[V]] = {}
+
+    def in_flight(self, key: K) -> bool:
+        """Assert if an execution is in flight for the key."""
+        with self._lock:
+            return key in self._flights
+
+    def do(self, key: K, func: Callable[[], V]) -> V:
+        """Execute func, or wait for the execution in flight for the key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight[V]()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+        except BaseException as err:
+            flight.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
@@ -19,13 +19,23 @@
 Utilities related to HTTP requests and URLs.
 """
 
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
 from typing import Literal
 from urllib.parse import parse_qsl, quote, urlencode, urlparse, urlunparse
 
+import requests
 from flask import Response, make_response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from mlflow_sharinghub.config import AppConfig
 
 HTTP_ERROR_RANGE = (400, 600)
+HTTP_SERVER_ERROR = 500
 HTTP_NOT_FOUND = 404
+HTTP_FORBIDDEN = 403
 HTTP_UNAUTHORIZED = 401
 HTTP_OK = 200
 
@@ -46,6 +56,11 @@ HTTP_METHODS = [
     "PATCH",
 ]
 
+_RETRY_STATUSES = (500, 502, 503, 504)
+
+_http_sessions: dict[str, requests.Session] = {}
+_http_sessions_lock = threading.Lock()
+
 
 def is_error(status_code: int) -> bool:
     """Return True if status_code is for an error, False otherwise."""
@@ -61,6 +76,85 @@ def clean_url(url: str, trailing_slash: bool = False) -> str:
     raise ValueError(msg)
 
 
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures.
+
+    After `threshold` consecutive failures, the circuit opens and calls are
+    refused for `cooldown` seconds, then a single trial call is allowed
+    again per cooldown until one succeeds. A threshold of 0 disables it.
+    """
+
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    def allow(self) -> bool:
+        """Assert if a call can be made upstream."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at >= self._cooldown:
+                self._opened_at = now  # trial call
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure, open the circuit after too many."""
+        with self._lock:
+            self._failures += 1
+            if 0 < self._threshold <= self._failures:
+                self._opened_at = time.monotonic()
+
+
+def get_http_session(base_url: str) -> requests.Session:
+    """Return the shared HTTP session for the given base URL.
+
+    Sessions keep their connections alive in a pool sized by HTTP_POOL_SIZE,
+    and retry with backoff on connection errors and 5xx responses. Cookies
+    received are never stored, as sessions are shared between users.
+    """
+    base_url = clean_url(base_url)
+    if http_session := _http_sessions.get(base_url):
+        return http_session
+    with _http_sessions_lock:
+        if base_url not in _http_sessions:
+            _http_sessions[base_url] = _create_http_session()
+        return _http_sessions[base_url]
+
+
+def _create_http_session() -> requests.Session:
+    retry = Retry(
+        total=AppConfig.HTTP_RETRIES,
+        connect=AppConfig.HTTP_RETRIES,
+        read=0,
+        status=AppConfig.HTTP_RETRIES,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        backoff_factor=AppConfig.HTTP_RETRY_BACKOFF,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=AppConfig.HTTP_POOL_SIZE,
+        pool_maxsize=AppConfig.HTTP_POOL_SIZE,
+        max_retries=retry,
+    )
+    http_session = requests.Session()
+    http_session.mount("http://", adapter)
+    http_session.mount("https://", adapter)
+    http_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return http_session
+
+
 def url_add_query_params(url: str, query_params: dict) -> str:
     """Return URL with added query params from mapping."""
     url_parts = list(urlparse(url))
@@ -0,0 +1,75 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Page token module (utils).
+
+Utilities to sign the page tokens of the filtered searches.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+
+
+def sign_page_token(
+    token: str, digest: str, secret_key: str, *, mode: str, scope: str
+) -> str:
+    """Wrap the backend page token in an opaque signed token.
+
+    Args:
+        token: The page token of the backend store.
+        digest: Digest of the search the token is valid for.
+        secret_key: Key used for the signature.
+        mode: How the search was answered, the backend token offset is
+            relative to it.
+        scope: Digest of the projects the backend search was restricted to.
+    """
+    data = json.dumps(
+        {"t": token, "d": digest, "m": mode, "s": scope}, separators=(",", ":")
+    )
+    payload = base64.urlsafe_b64encode(data.encode()).decode()
+    return f"{payload}.{_sign(payload, secret_key)}"
+
+
+def verify_page_token(
+    signed_token: str, digest: str, secret_key: str, *, mode: str, scope: str
+) -> str:
+    """Return the backend page token from the signed token.
+
+    Raises:
+        ValueError: If the token is malformed, its signature invalid, or if it
+            was issued for another search, search mode or projects scope.
+    """
+    payload, _, signature = signed_token.rpartition(".")
+    if not payload or not hmac.compare_digest(signature, _sign(payload, secret_key)):
+        msg = "Invalid page token"
+        raise ValueError(msg)
+    data = json.loads(base64.urlsafe_b64decode(payload))
+    if data.get("d") != digest:
+        msg = "Page token was issued for another search"
+        raise ValueError(msg)
+    if data.get("m") != mode:
+        msg = "Page token was issued for another search mode"
+        raise ValueError(msg)
+    if data.get("s") != scope:
+        msg = "Page token was issued for other projects"
+        raise ValueError(msg)
+    return data["t"]
+
+
+def _sign(payload: str, secret_key: str) -> str:
+    return hmac.new(secret_key.encode(), payload.encode(), hashlib.sha256).hexdigest()
@@ -0,0 +1,62 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Stats module (utils).
+
+Process-wide counters, reported with the caches statistics.
+"""
+
+import threading
+from collections import OrderedDict
+
+# Named counters, for statistics
+_counters: dict[str, "KeyedCounter"] = {}
+
+
+class KeyedCounter:
+    """Thread-safe counters by key.
+
+    The least recently incremented key is dropped when the counter is full.
+    """
+
+    def __init__(self, name: str, maxsize: int) -> None:
+        """KeyedCounter constructor.
+
+        Args:
+            name: Name of the counter, listed in statistics.
+            maxsize: Maximum number of keys.
+        """
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._counts: OrderedDict[str, int] = OrderedDict()
+        _counters[name] = self
+
+    def add(self, key: str, amount: int) -> None:
+        """Add amount to the count of the key."""
+        with self._lock:
+            self._counts[key] = self._counts.pop(key, 0) + amount
+            if len(self._counts) > self._maxsize:
+                self._counts.popitem(last=False)
+
+    def counts(self) -> dict[str, int]:
+        """Return the count of each key."""
+        with self._lock:
+            return dict(sorted(self._counts.items()))
+
+
+def get_counters_stats() -> dict[str, dict[str, int]]:
+    """Return the counts of the named counters."""
+    return {name: counter.counts() for name, counter in sorted(_counters.items())}
@@ -0,0 +1,38 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests configuration.
+
+The MLflow stores are created when the plugin modules are imported, they
+are pointed to a temporary SQL database before any test module imports them.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from mlflow.server import ARTIFACT_ROOT_ENV_VAR, BACKEND_STORE_URI_ENV_VAR
+
+_STORE_DIR = Path(tempfile.mkdtemp(prefix="mlflow-sharinghub-tests-"))
+os.environ.setdefault(BACKEND_STORE_URI_ENV_VAR, f"sqlite:///{_STORE_DIR}/mlflow.db")
+os.environ.setdefault(ARTIFACT_ROOT_ENV_VAR, str(_STORE_DIR / "artifacts"))
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:  # noqa: ARG001
+    """Remove the temporary store."""
+    shutil.rmtree(_STORE_DIR, ignore_errors=True)
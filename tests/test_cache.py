@@ -0,0 +1,250 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache utilities tests."""
+
+import fnmatch
+import os
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from mlflow_sharinghub.utils.cache import (
+    LRUCache,
+    RedisCache,
+    SharedMemoryCache,
+    SingleFlight,
+    get_caches_stats,
+    hash_key,
+)
+
+
+class InProcessRedis:
+    """In-process stand-in for the Redis server, with keys expiration."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[float | None, bytes]] = {}
+
+    def get(self, name: str) -> bytes | None:
+        """Return the value at key name, or None."""
+        item = self.data.get(name)
+        if item is None:
+            return None
+        expire_at, value = item
+        if expire_at is not None and time.monotonic() >= expire_at:
+            del self.data[name]
+            return None
+        return value
+
+    def set(
+        self, name: str, value: bytes, px: int | None = None, nx: bool = False
+    ) -> bool | None:
+        """Set the value at key name, expiring in px milliseconds."""
+        if nx and self.get(name) is not None:
+            return None
+        expire_at = None if px is None else time.monotonic() + px / 1000
+        self.data[name] = (expire_at, value)
+        return True
+
+    def delete(self, *names: str | bytes) -> int:
+        """Delete the keys."""
+        names = [n.decode() if isinstance(n, bytes) else n for n in names]
+        return sum(self.data.pop(n, None) is not None for n in names)
+
+    def scan_iter(self, match: str | None = None) -> Iterator[bytes]:
+        """Iterate over the keys matching the pattern."""
+        for name in list(self.data):
+            if self.get(name) is not None and fnmatch.fnmatch(name, match or "*"):
+                yield name.encode()
+
+
+def test_hash_key_is_stable():
+    """Same parts give same key, different parts give different keys."""
+    assert hash_key("token", "group/project") == hash_key("token", "group/project")
+    assert hash_key("token", "group/project") != hash_key("token", "group/other")
+    assert hash_key("ab", "c") != hash_key("a", "bc")
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """The least recently used entry is evicted when full."""
+    maxsize = 2
+    first, second, third = 1, 2, 3
+    cache = LRUCache[str, int](maxsize=maxsize)
+    cache.set("a", first)
+    cache.set("b", second)
+    assert cache.get("a") == first
+    cache.set("c", third)
+    assert cache.get("b") is None
+    assert cache.get("a") == first
+    assert cache.get("c") == third
+    assert len(cache) == maxsize
+
+
+def test_lru_cache_expires():
+    """Entries older than the timeout are not returned."""
+    cache = LRUCache[str, int](maxsize=2, timeout=0.01)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.02)
+    assert cache.get("a", -1) == -1
+    assert len(cache) == 0
+
+
+def test_lru_cache_stats():
+    """Hits and misses are counted, named caches are listed."""
+    cache = LRUCache[str, int](maxsize=2, name="test")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    assert get_caches_stats()["test"] == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Concurrent calls for the same key share a single execution."""
+    flights = SingleFlight[str, int]()
+    calls = []
+    release = threading.Event()
+
+    def lookup() -> int:
+        calls.append(1)
+        release.wait(1)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flights.do, "key", lookup) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        assert [f.result() for f in futures] == [42] * 4
+    assert len(calls) == 1
+    assert flights.do("key", lambda: 1) == 1
+
+
+def test_lru_cache_grace():
+    """Expired entries are still retrievable as stale during the grace."""
+    cache = LRUCache[str, int](maxsize=2, timeout=0.01, grace=0.05)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.get_stale("a") == 1
+    time.sleep(0.05)
+    assert cache.get_stale("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_refresh_ahead():
+    """An entry past the refresh-ahead fraction is claimed once until set."""
+    cache = LRUCache[str, int](maxsize=2, timeout=0.1, refresh_ahead=0.5)
+    cache.set("a", 1)
+    assert not cache.claim_refresh("a")
+    time.sleep(0.06)
+    assert cache.claim_refresh("a")
+    assert not cache.claim_refresh("a")
+    assert cache.get("a") == 1
+    cache.set("a", 2)
+    assert not cache.claim_refresh("a")
+    assert not cache.claim_refresh("b")
+
+
+def test_redis_cache_shared_between_instances():
+    """Caches of the same name over the same server share their entries."""
+    server = InProcessRedis()
+    cache = RedisCache[str, tuple[bool, dict[str, int]]](
+        server, name="shared", timeout=0.05, grace=0.05, prefix="test:"
+    )
+    replica = RedisCache[str, tuple[bool, dict[str, int]]](
+        server, name="shared", timeout=0.05, grace=0.05, prefix="test:"
+    )
+    cache.set("a", (True, {"group/project": 30}))
+    assert replica.get("a") == (True, {"group/project": 30})
+    assert replica.stats() == {"hits": 1, "misses": 0}
+    time.sleep(0.06)
+    assert replica.get("a") is None
+    assert replica.get_stale("a") == (True, {"group/project": 30})
+    time.sleep(0.05)
+    assert replica.get_stale("a") is None
+    cache.set("b", (False, {}))
+    replica.clear()
+    assert cache.get("b") is None
+
+
+def test_redis_cache_refresh_claimed_once():
+    """The renewal of an entry is claimed once between the instances."""
+    server = InProcessRedis()
+    cache = RedisCache[str, int](server, name="claims", timeout=0.1, refresh_ahead=0.5)
+    replica = RedisCache[str, int](
+        server, name="claims", timeout=0.1, refresh_ahead=0.5
+    )
+    cache.set("a", 1)
+    assert not cache.claim_refresh("a")
+    time.sleep(0.06)
+    assert replica.claim_refresh("a")
+    assert not cache.claim_refresh("a")
+    updated = 2
+    cache.set("a", updated)
+    assert replica.get("a") == updated
+    assert not replica.claim_refresh("a")
+
+
+def test_redis_cache_errors_are_misses():
+    """Backend errors are handled as cache misses."""
+
+    class UnavailableRedis(InProcessRedis):
+        def get(self, name: str) -> bytes | None:
+            raise ConnectionError(name)
+
+    cache = RedisCache[str, int](
+        UnavailableRedis(), name="unavailable", errors=(ConnectionError,)
+    )
+    cache.set("a", 1)
+    assert cache.get("a", -1) == -1
+    assert cache.stats()["misses"] == 1
+
+
+def test_shared_memory_cache_shared_between_processes(tmp_path: Path):
+    """Entries set by a forked process are read from the same table."""
+    path = str(tmp_path / "table")
+    warm_value, child_value = 30, 40
+    cache = SharedMemoryCache(path, slots=64, timeout=10)
+    cache.set("warm", warm_value)
+    pid = os.fork()
+    if pid == 0:
+        child = SharedMemoryCache(path, slots=64, timeout=10)
+        child.set("a", child_value)
+        os._exit(0 if child.get("warm") == warm_value else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert cache.get("a") == child_value
+    cache.delete("a")
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_shared_memory_cache_replaces_oldest(tmp_path: Path):
+    """A full probe window replaces its oldest entry, expired entries are stale."""
+    cache = SharedMemoryCache(
+        str(tmp_path / "table"), slots=8, timeout=0.05, grace=0.05
+    )
+    for i in range(9):
+        cache.set(str(i), i)
+    assert cache.get("0") is None
+    assert [cache.get(str(i)) for i in range(1, 9)] == list(range(1, 9))
+    time.sleep(0.06)
+    assert cache.get("1") is None
+    assert cache.get_stale("1") == 1
+    cache.clear()
+    assert len(cache) == 0
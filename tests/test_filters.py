@@ -0,0 +1,162 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Search filters tests."""
+
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from flask import Flask
+from mlflow.store.entities import PagedList
+from mlflow.utils.search_utils import SearchUtils
+from mlflow_sharinghub.hooks.handlers import filters
+from mlflow_sharinghub.permissions import Permission
+
+READABLE = Permission(
+    priority=1, can_create=False, can_read=True, can_update=False, can_delete=False
+)
+UNREADABLE = Permission(
+    priority=0, can_create=False, can_read=False, can_update=False, can_delete=False
+)
+
+
+class Store:
+    """Store of rows, one readable out of `ratio`, read by offset tokens."""
+
+    def __init__(self, count: int, ratio: int) -> None:
+        self.rows = [
+            {"id": i, "project": "readable" if i % ratio == 0 else "private"}
+            for i in range(count)
+        ]
+        self.batch_sizes: list[int] = []
+
+    def search(self, page_token: str, max_results: int) -> PagedList[dict]:
+        """Read a batch of rows, like the search refetches."""
+        self.batch_sizes.append(max_results)
+        offset = SearchUtils.parse_start_offset_from_page_token(page_token or None)
+        end = offset + max_results
+        token = SearchUtils.create_page_token(end) if end < len(self.rows) else None
+        return PagedList(self.rows[offset:end], token)
+
+    def scan(
+        self,
+        page_token: str,
+        max_results: int,
+        max_scanned_rows: int | None = None,
+    ) -> filters.SearchScan:
+        """Start the scan of a page, like the search filters."""
+        first_batch = self.search(page_token, max_results)
+        return filters.SearchScan(
+            entities=list(first_batch),
+            page_token=page_token,
+            next_page_token=first_batch.token or "",
+            refetch=self.search,
+            get_project_tags=lambda rows: [row["project"] for row in rows],
+            max_results=max_results,
+            max_scanned_rows=max_scanned_rows,
+        )
+
+
+@pytest.fixture(autouse=True)
+def _search_request(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(filters, "to_json_dict", lambda row: row)
+    monkeypatch.setattr(
+        filters,
+        "get_permissions_for_project_tags",
+        lambda tags: {
+            tag: READABLE if tag == "readable" else UNREADABLE for tag in set(tags)
+        },
+    )
+    with Flask(__name__).test_request_context("/api/2.0/mlflow/runs/search"):
+        yield
+
+
+def _read_page(scan: filters.SearchScan) -> list[Any]:
+    return [row["id"] for chunk in scan for row in chunk]
+
+
+def test_scan_pages_continuity():
+    """Following the next page tokens reads each readable row once, in order."""
+    store = Store(count=100, ratio=3)
+    page_token, ids = "", []
+    while True:
+        scan = store.scan(page_token, max_results=7)
+        ids.extend(_read_page(scan))
+        if not (page_token := scan.page_token):
+            break
+    assert ids == [row["id"] for row in store.rows if row["project"] == "readable"]
+
+
+def test_scan_page_token_from_last_consumed_row():
+    """The next page starts after the row that filled the page."""
+    last_consumed_row = 12
+    store = Store(count=100, ratio=3)
+    scan = store.scan("", max_results=5)
+    assert _read_page(scan) == [0, 3, 6, 9, last_consumed_row]
+    assert scan.scanned == last_consumed_row + 1
+    assert (
+        SearchUtils.parse_start_offset_from_page_token(scan.page_token)
+        == last_consumed_row + 1
+    )
+
+
+def test_scan_batches_grow_with_unreadable_ratio():
+    """Refetched batches are sized from the readable ratio, and grow."""
+    max_results = 10
+    store = Store(count=1000, ratio=10)
+    scan = store.scan("", max_results=max_results)
+    assert len(_read_page(scan)) == max_results
+    assert store.batch_sizes == [10, 20, 40, 30]
+
+
+@pytest.mark.parametrize(
+    ("gap", "scanned", "readable", "previous", "expected"),
+    [
+        (10, 10, 0, 10, 20),  # nothing readable yet: doubled
+        (10, 100, 10, 100, 100),  # estimate from the readable ratio
+        (10, 100, 50, 100, 20),  # estimate lower than the growth
+        (10, 100, 100, 100, 10),  # all readable: at least the gap
+    ],
+)
+def test_next_batch_size(
+    gap: int, scanned: int, readable: int, previous: int, expected: int
+):
+    """Batch size is the readable ratio estimate, bounded by the growth."""
+    batch_size = filters._next_batch_size(gap, scanned, readable, previous)  # noqa: SLF001
+    assert batch_size == expected
+
+
+def test_scan_cap_returns_next_token():
+    """Scan stops at the cap with a partial page and the token to resume it."""
+    max_scanned_rows = 50
+    store = Store(count=1000, ratio=100)
+    scan = store.scan("", max_results=10, max_scanned_rows=max_scanned_rows)
+    assert _read_page(scan) == [0]
+    assert scan.scanned == max_scanned_rows
+    assert (
+        SearchUtils.parse_start_offset_from_page_token(scan.page_token)
+        == max_scanned_rows
+    )
+    resumed = store.scan(scan.page_token, max_results=10, max_scanned_rows=200)
+    assert _read_page(resumed) == [100, 200]
+
+
+def test_scan_without_cap_fills_the_page():
+    """Without a cap, sparse results are scanned until the page is full."""
+    store = Store(count=1000, ratio=100)
+    scan = store.scan("", max_results=5)
+    assert _read_page(scan) == [0, 100, 200, 300, 400]
@@ -0,0 +1,88 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""GitLab client tests."""
+
+import json
+import uuid
+
+import pytest
+import requests
+from mlflow_sharinghub.auth import RequestAuth
+from mlflow_sharinghub.clients.base import ProjectMetadata, save_project_metadata
+from mlflow_sharinghub.clients.gitlab import GitlabClient
+from mlflow_sharinghub.utils.gitlab import DEVELOPER
+
+REST_URL = "https://gitlab.example.com/api/v4"
+USER_ID = 7
+
+
+class Session:
+    """HTTP session answering the given JSON by URL, 404 otherwise."""
+
+    def __init__(self, routes: dict[str, dict]) -> None:
+        self.routes = routes
+        self.urls: list[str] = []
+
+    def get(self, url: str, **_: object) -> requests.Response:
+        """Answer the GET request, record its URL."""
+        self.urls.append(url)
+        response = requests.Response()
+        response.url = url
+        if url in self.routes:
+            response.status_code = 200
+            response._content = json.dumps(self.routes[url]).encode()  # noqa: SLF001
+        else:
+            response.status_code = 404
+        return response
+
+
+def _create_client(session: Session) -> GitlabClient:
+    request_auth = RequestAuth(headers={"Authorization": f"Bearer {uuid.uuid4()}"})
+    client = GitlabClient(url="https://gitlab.example.com", request_auth=request_auth)
+    client.session = session  # type: ignore[assignment]
+    return client
+
+
+@pytest.fixture()
+def project_path() -> str:
+    """Path of a project with cached metadata."""
+    path = f"group-{uuid.uuid4().hex}/project"
+    save_project_metadata(ProjectMetadata(id=1, path=path, topics=[]))
+    return path
+
+
+def test_role_read_from_membership(project_path: str):
+    """With cached metadata, only the membership is fetched, the user id once."""
+    member_url = f"{REST_URL}/projects/1/members/all/{USER_ID}"
+    session = Session(
+        {
+            f"{REST_URL}/user": {"id": USER_ID},
+            member_url: {"id": USER_ID, "access_level": DEVELOPER.access_level},
+        }
+    )
+    client = _create_client(session)
+    for _ in range(2):
+        project = client.get_project(project_path)
+        assert project is not None
+        assert project.role == DEVELOPER
+    assert session.urls == [f"{REST_URL}/user", member_url, member_url]
+
+
+def test_not_a_member(project_path: str):
+    """A project the user is not a member of, or cannot see, is not returned."""
+    client = _create_client(Session({f"{REST_URL}/user": {"id": USER_ID}}))
+    assert client.get_project(project_path) is None
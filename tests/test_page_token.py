@@ -0,0 +1,88 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Page token utilities tests."""
+
+import base64
+import json
+
+import pytest
+from mlflow_sharinghub.utils.page_token import sign_page_token, verify_page_token
+
+SECRET_KEY = "secret"  # noqa: S105
+SCOPE = {"mode": "filtered", "scope": "projects-digest"}
+
+
+def test_page_token_roundtrip():
+    """Signed token gives back the backend token."""
+    signed = sign_page_token("eyJvZmZzZXQiOiAxMH0=", "digest", SECRET_KEY, **SCOPE)
+    assert (
+        verify_page_token(signed, "digest", SECRET_KEY, **SCOPE)
+        == "eyJvZmZzZXQiOiAxMH0="
+    )
+
+
+def test_page_token_payload():
+    """Signed payload binds the token to the search, its mode and its projects."""
+    signed = sign_page_token("token", "digest", SECRET_KEY, **SCOPE)
+    payload = json.loads(base64.urlsafe_b64decode(signed.rpartition(".")[0]))
+    assert payload == {
+        "t": "token",
+        "d": "digest",
+        "m": "filtered",
+        "s": "projects-digest",
+    }
+
+
+def test_page_token_other_search():
+    """Token issued for another search is rejected."""
+    signed = sign_page_token("token", "digest", SECRET_KEY, **SCOPE)
+    with pytest.raises(ValueError, match="another search"):
+        verify_page_token(signed, "other-digest", SECRET_KEY, **SCOPE)
+
+
+def test_page_token_other_mode():
+    """Token issued for a post-filtered search is rejected by a scoped search."""
+    signed = sign_page_token("token", "digest", SECRET_KEY, **SCOPE)
+    with pytest.raises(ValueError, match="another search mode"):
+        verify_page_token(
+            signed, "digest", SECRET_KEY, mode="scoped", scope="projects-digest"
+        )
+
+
+def test_page_token_other_projects():
+    """Token issued for other readable projects is rejected."""
+    signed = sign_page_token("token", "digest", SECRET_KEY, **SCOPE)
+    with pytest.raises(ValueError, match="other projects"):
+        verify_page_token(
+            signed, "digest", SECRET_KEY, mode="filtered", scope="other-digest"
+        )
+
+
+@pytest.mark.parametrize(
+    "signed",
+    [
+        "",
+        "not-a-token",
+        sign_page_token("token", "digest", "other-secret", **SCOPE),
+        sign_page_token("token", "digest", SECRET_KEY, **SCOPE).rpartition(".")[0]
+        + ".0",
+    ],
+)
+def test_page_token_invalid(signed: str):
+    """Malformed or forged tokens are rejected."""
+    with pytest.raises(ValueError, match="Invalid page token"):
+        verify_page_token(signed, "digest", SECRET_KEY, **SCOPE)
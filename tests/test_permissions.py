@@ -0,0 +1,172 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Permissions tests."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from mlflow import MlflowException
+from mlflow.protos.databricks_pb2 import TEMPORARILY_UNAVAILABLE
+from mlflow_sharinghub import permissions
+from mlflow_sharinghub.auth import RequestAuth
+from mlflow_sharinghub.clients import ProjectInfo
+from mlflow_sharinghub.utils.cache import LRUCache
+from mlflow_sharinghub.utils.gitlab import DEVELOPER, REPORTER, GitlabRole
+
+TIMEOUT = 0.1
+GRACE = 0.1
+
+
+def test_stale_role_expires_when_refresh_fails(monkeypatch: pytest.MonkeyPatch):
+    """A stale role is not saved again, it expires after timeout and grace."""
+    upstream_available = True
+
+    def lookup_role_upstream(*_: object) -> tuple[GitlabRole, bool]:
+        if not upstream_available:
+            msg = "Projects service unavailable"
+            raise MlflowException(msg, TEMPORARILY_UNAVAILABLE)
+        return DEVELOPER, True
+
+    request_auth = RequestAuth(headers={"Authorization": "Bearer token"})
+    monkeypatch.setattr(permissions, "get_request_auth", lambda: request_auth)
+    monkeypatch.setattr(permissions, "_lookup_role_upstream", lookup_role_upstream)
+    monkeypatch.setattr(
+        permissions,
+        "_session_projects_access_level",
+        LRUCache[str, int](maxsize=10, timeout=TIMEOUT),
+    )
+    monkeypatch.setattr(
+        permissions,
+        "_projects_access_level",
+        LRUCache[str, int](maxsize=10, timeout=TIMEOUT, grace=GRACE),
+    )
+    monkeypatch.setattr(permissions, "_lookup_executor", ThreadPoolExecutor(1))
+
+    assert permissions.get_permission_for_project("group/project").can_update
+    upstream_available = False
+    time.sleep(TIMEOUT * 1.2)
+    assert permissions.get_permission_for_project("group/project").can_update
+    time.sleep(GRACE * 0.5)
+    assert permissions.get_permission_for_project("group/project").can_update
+    time.sleep(GRACE * 0.6)
+    with pytest.raises(MlflowException):
+        permissions.get_permission_for_project("group/project")
+
+
+def test_renewed_role_is_fetched_from_upstream(monkeypatch: pytest.MonkeyPatch):
+    """A role renewed ahead of expiration is not read from the cached listing."""
+
+    class Client:
+        def get_project(self, path: str) -> ProjectInfo:
+            return ProjectInfo(id=1, path=path, role=REPORTER)
+
+    request_auth = RequestAuth(headers={"Authorization": "Bearer token"})
+    executor = ThreadPoolExecutor(1)
+    listing = LRUCache[str, tuple[bool, dict[str, int]]](maxsize=10, timeout=10)
+    listing.set(
+        request_auth.fingerprint, (True, {"group/project": DEVELOPER.access_level})
+    )
+    monkeypatch.setattr(permissions, "get_request_auth", lambda: request_auth)
+    monkeypatch.setattr(permissions, "create_client", lambda **_: Client())
+    monkeypatch.setattr(permissions, "_users_projects_access_level", listing)
+    monkeypatch.setattr(
+        permissions,
+        "_session_projects_access_level",
+        LRUCache[str, int](maxsize=10, timeout=TIMEOUT / 2),
+    )
+    monkeypatch.setattr(
+        permissions,
+        "_projects_access_level",
+        LRUCache[str, int](maxsize=10, timeout=TIMEOUT, refresh_ahead=0.5),
+    )
+    monkeypatch.setattr(permissions, "_lookup_executor", executor)
+
+    assert permissions.get_permission_for_project("group/project").can_update
+    time.sleep(TIMEOUT * 0.6)
+    assert permissions.get_permission_for_project("group/project").can_update
+    executor.shutdown(wait=True)
+    assert not permissions.get_permission_for_project("group/project").can_update
+
+
+def test_role_from_stale_listing_is_not_saved(monkeypatch: pytest.MonkeyPatch):
+    """A role read from a recently expired listing is used for this request only."""
+
+    class Client:
+        def list_projects(self) -> list[ProjectInfo]:
+            raise requests.ConnectionError
+
+    request_auth = RequestAuth(headers={"Authorization": "Bearer token"})
+    executor = ThreadPoolExecutor(1)
+    listing = LRUCache[str, tuple[bool, dict[str, int]]](
+        maxsize=10, timeout=TIMEOUT, grace=GRACE * 10
+    )
+    listing.set(
+        request_auth.fingerprint, (True, {"group/project": DEVELOPER.access_level})
+    )
+    session = LRUCache[str, int](maxsize=10, timeout=TIMEOUT)
+    projects_access_level = LRUCache[str, int](maxsize=10, timeout=TIMEOUT)
+    monkeypatch.setattr(permissions, "get_request_auth", lambda: request_auth)
+    monkeypatch.setattr(permissions, "create_client", lambda **_: Client())
+    monkeypatch.setattr(permissions, "_users_projects_access_level", listing)
+    monkeypatch.setattr(permissions, "_session_projects_access_level", session)
+    monkeypatch.setattr(permissions, "_projects_access_level", projects_access_level)
+    monkeypatch.setattr(permissions, "_lookup_executor", executor)
+
+    time.sleep(TIMEOUT * 1.2)
+    assert permissions.get_permission_for_project("group/project").can_update
+    executor.shutdown(wait=True)
+    assert session.get("group/project") is None
+    assert len(projects_access_level) == 0
+
+
+@pytest.mark.parametrize("status_code", [401, 403])
+def test_role_dropped_when_refresh_denied(
+    monkeypatch: pytest.MonkeyPatch, status_code: int
+):
+    """A role is not served again when its refresh is denied upstream."""
+
+    class Client:
+        def get_project(self, path: str) -> ProjectInfo:  # noqa: ARG002
+            response = requests.Response()
+            response.status_code = status_code
+            raise requests.HTTPError(response=response)
+
+    request_auth = RequestAuth(headers={"Authorization": "Bearer token"})
+    executor = ThreadPoolExecutor(1)
+    projects_access_level = LRUCache[str, int](
+        maxsize=10, timeout=TIMEOUT, grace=GRACE, refresh_ahead=0.5
+    )
+    projects_access_level.set(
+        permissions._cache_key("group/project", request_auth),  # noqa: SLF001
+        DEVELOPER.access_level,
+    )
+    monkeypatch.setattr(permissions, "get_request_auth", lambda: request_auth)
+    monkeypatch.setattr(permissions, "create_client", lambda **_: Client())
+    monkeypatch.setattr(
+        permissions,
+        "_session_projects_access_level",
+        LRUCache[str, int](maxsize=10, timeout=TIMEOUT),
+    )
+    monkeypatch.setattr(permissions, "_projects_access_level", projects_access_level)
+    monkeypatch.setattr(permissions, "_lookup_executor", executor)
+
+    time.sleep(TIMEOUT * 0.6)
+    assert permissions.get_access_level("group/project", request_auth) is not None
+    executor.shutdown(wait=True)
+    assert len(projects_access_level) == 0
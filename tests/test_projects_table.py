@@ -0,0 +1,104 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Projects table tests."""
+
+import uuid
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from mlflow.entities import ExperimentTag
+from mlflow.protos.service_pb2 import SearchExperiments
+from mlflow_sharinghub._internal import projects_table, store
+from mlflow_sharinghub.config import AppConfig
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.exc import OperationalError
+
+LATEST_REVISION = "5d1c2e8f4a37"
+
+
+def _get_revision(engine: object) -> str | None:
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn, opts={"version_table": projects_table.VERSION_TABLE}
+        )
+        return context.get_current_revision()
+
+
+def test_upgrade_versions_the_tables(tmp_path: Path):
+    """Tables are created by the migrations, in their own version table."""
+    engine = create_engine(f"sqlite:///{tmp_path}/mlflow.db")
+    projects_table.upgrade(engine)
+    projects_table.upgrade(engine)
+    assert _get_revision(engine) == LATEST_REVISION
+    assert set(projects_table.metadata.tables) <= set(inspect(engine).get_table_names())
+
+
+def test_upgrade_tables_created_without_revision(tmp_path: Path):
+    """Tables created before the migrations are upgraded in place."""
+    engine = create_engine(f"sqlite:///{tmp_path}/mlflow.db")
+    projects_table.experiments_projects.create(engine)
+    projects_table.registered_models_projects.create(engine)
+    projects_table.upgrade(engine)
+    assert _get_revision(engine) == LATEST_REVISION
+    with engine.connect() as conn:
+        assert not projects_table.is_backfilled(
+            conn, projects_table.experiments_projects
+        )
+
+
+def test_search_uses_the_table_once_backfilled(monkeypatch: pytest.MonkeyPatch):
+    """Searches use the tags until the table is backfilled, and if out of sync."""
+    monkeypatch.setattr(AppConfig, "PROJECT_TABLE", True)
+    monkeypatch.setattr(store, "_unsynced_projects_tables", set())
+    engine = store._tracking_store.engine  # noqa: SLF001
+    table = projects_table.experiments_projects
+    store.setup_projects_table()
+    projects_table.clear_backfilled(engine, table)
+
+    project_path = f"group-{uuid.uuid4().hex}/project"
+    store.get_tracking_store().create_experiment(
+        f"{project_path}-experiment",
+        tags=[ExperimentTag(AppConfig.PROJECT_TAG, project_path)],
+    )
+    request_message = SearchExperiments(max_results=10)
+
+    def search() -> list[str]:
+        return [
+            e.name
+            for e in store.search_experiments_in_projects(
+                [project_path], request_message, ""
+            )
+        ]
+
+    # not in the table, found from the tags
+    assert search() == [f"{project_path}-experiment"]
+    projects_table.backfill_experiments(engine, AppConfig.PROJECT_TAG)
+    with engine.connect() as conn:
+        assert projects_table.is_backfilled(conn, table)
+    assert search() == [f"{project_path}-experiment"]
+
+    def fail(*_: object) -> None:
+        msg = "INSERT"
+        raise OperationalError(msg, {}, Exception("database is locked"))
+
+    monkeypatch.setattr(projects_table, "save_experiment", fail)
+    store.save_experiment_project("0", "other", project_path)
+    with engine.connect() as conn:
+        assert not projects_table.is_backfilled(conn, table)
+    assert table.name in store._unsynced_projects_tables  # noqa: SLF001
+    assert search() == [f"{project_path}-experiment"]
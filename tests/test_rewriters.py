@@ -0,0 +1,109 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Search rewriters tests, against the SQL store of the tests."""
+
+import uuid
+from typing import Any
+
+import pytest
+from flask import Flask
+from mlflow import MlflowException
+from mlflow.entities import ExperimentTag
+from mlflow.protos.service_pb2 import SearchExperiments
+from mlflow_sharinghub._internal.store import get_tracking_store
+from mlflow_sharinghub.config import AppConfig
+from mlflow_sharinghub.hooks.handlers import rewriters
+
+app = Flask(__name__)
+
+
+@pytest.fixture()
+def projects() -> list[str]:
+    """Create two experiments in each of three projects."""
+    group = f"group-{uuid.uuid4().hex}"
+    project_paths = [f"{group}/{name}" for name in "abc"]
+    for project_path in project_paths:
+        for index in range(2):
+            get_tracking_store().create_experiment(
+                f"{project_path}-{index}",
+                tags=[ExperimentTag(AppConfig.PROJECT_TAG, project_path)],
+            )
+    return project_paths
+
+
+def _search(
+    monkeypatch: pytest.MonkeyPatch,
+    readable_project_paths: list[str] | None,
+    page_token: str = "",
+) -> tuple[list[str], str]:
+    """Search experiments like a client, return the names and signed token."""
+    monkeypatch.setattr(
+        rewriters, "get_readable_project_paths", lambda: readable_project_paths
+    )
+    body: dict[str, Any] = {"max_results": 3, "order_by": ["name"]}
+    if page_token:
+        body["page_token"] = page_token
+    with app.test_request_context(
+        "/api/2.0/mlflow/experiments/search", method="POST", json=body
+    ):
+        response = rewriters.search_experiments()
+        assert response is not None
+        data = response.get_json()
+        next_page_token = data.get("next_page_token", "")
+        if next_page_token:
+            next_page_token = rewriters.sign_search_page_token(
+                SearchExperiments, next_page_token
+            )
+    return [e["name"] for e in data.get("experiments", [])], next_page_token
+
+
+def test_scoped_search_pages(monkeypatch: pytest.MonkeyPatch, projects: list[str]):
+    """Scoped search pages are dense and continue from the signed token."""
+    readable = projects[:2]
+    names, page_token = _search(monkeypatch, readable)
+    assert names == [f"{readable[0]}-0", f"{readable[0]}-1", f"{readable[1]}-0"]
+    names, page_token = _search(monkeypatch, readable, page_token)
+    assert names == [f"{readable[1]}-1"]
+    assert not page_token
+
+
+def test_scoped_token_rejected_when_filtered(
+    monkeypatch: pytest.MonkeyPatch, projects: list[str]
+):
+    """A scoped token is rejected when the listing is no longer available."""
+    _, page_token = _search(monkeypatch, projects[:2])
+    with pytest.raises(MlflowException, match="another search mode"):
+        _search(monkeypatch, None, page_token)
+
+
+def test_scoped_token_rejected_for_other_projects(
+    monkeypatch: pytest.MonkeyPatch, projects: list[str]
+):
+    """A scoped token is rejected when the readable projects changed."""
+    _, page_token = _search(monkeypatch, projects[:2])
+    with pytest.raises(MlflowException, match="other projects"):
+        _search(monkeypatch, projects, page_token)
+
+
+def test_filtered_search_is_not_answered(monkeypatch: pytest.MonkeyPatch):
+    """Without the listing, the search is left to MLflow and post-filtered."""
+    monkeypatch.setattr(rewriters, "get_readable_project_paths", lambda: None)
+    with app.test_request_context(
+        "/api/2.0/mlflow/experiments/search", method="POST", json={"max_results": 3}
+    ):
+        assert rewriters.search_experiments() is None
+        assert not rewriters.is_search_scoped()
@@ -0,0 +1,38 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Stats utilities tests."""
+
+from mlflow_sharinghub.utils.stats import KeyedCounter, get_counters_stats
+
+
+def test_keyed_counter_stats():
+    """Counts are summed by key and reported under the counter name."""
+    counter = KeyedCounter("test_scanned_rows", maxsize=10)
+    counter.add("alice", 100)
+    counter.add("bob", 20)
+    counter.add("alice", 50)
+    assert get_counters_stats()["test_scanned_rows"] == {"alice": 150, "bob": 20}
+
+
+def test_keyed_counter_maxsize():
+    """The least recently incremented key is dropped when full."""
+    counter = KeyedCounter("test_bounded", maxsize=2)
+    counter.add("alice", 1)
+    counter.add("bob", 1)
+    counter.add("alice", 1)
+    counter.add("carol", 1)
+    assert counter.counts() == {"alice": 2, "carol": 1}
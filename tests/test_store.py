@@ -0,0 +1,40 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Internal store tests, against the SQL store of the tests."""
+
+import uuid
+
+from mlflow.entities.model_registry import RegisteredModelTag
+from mlflow_sharinghub._internal import store
+from mlflow_sharinghub.config import AppConfig
+
+
+def test_registered_model_update_ignores_local_index():
+    """Updates read the project from the store, the local index may be stale."""
+    name = f"model-{uuid.uuid4().hex}"
+    store.get_model_registry_store().create_registered_model(
+        name, tags=[RegisteredModelTag(AppConfig.PROJECT_TAG, "group/new-project")]
+    )
+    # deleted and re-created in another worker
+    store.index_registered_model(name, "group/old-project")
+
+    assert store.get_registered_model_project_path(name) == "group/old-project"
+    assert (
+        store.get_registered_model_project_path(name, for_update=True)
+        == "group/new-project"
+    )
+    assert store.get_registered_model_project_path(name) == "group/new-project"
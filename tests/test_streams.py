@@ -0,0 +1,82 @@
+# Copyright 2024, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of SharingHub project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Search streams tests."""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from mlflow import MlflowException
+from mlflow.protos.databricks_pb2 import TEMPORARILY_UNAVAILABLE
+from mlflow_sharinghub.hooks.handlers import streams
+
+
+class Scan:
+    """Scan yielding the given chunks, failing after them if requested."""
+
+    def __init__(
+        self, chunks: list[list[dict[str, Any]]], page_token: str, fail: bool = False
+    ) -> None:
+        self.chunks = chunks
+        self.page_token = page_token
+        self.fail = fail
+
+    def __iter__(self) -> Iterator[list[dict[str, Any]]]:
+        yield from self.chunks
+        if self.fail:
+            msg = "Projects service unavailable"
+            raise MlflowException(msg, TEMPORARILY_UNAVAILABLE)
+
+
+def _generate(scan: Scan) -> Iterator[str]:
+    return streams._generate_runs(scan, lambda token: f"signed-{token}")  # noqa: SLF001
+
+
+@pytest.mark.parametrize(
+    ("chunks", "page_token", "expected"),
+    [
+        (
+            [[{"info": {"run_id": "1"}}], [{"info": {"run_id": "2"}}]],
+            "token",
+            {
+                "runs": [{"info": {"run_id": "1"}}, {"info": {"run_id": "2"}}],
+                "next_page_token": "signed-token",
+            },
+        ),
+        ([[{"info": {"run_id": "1"}}]], "", {"runs": [{"info": {"run_id": "1"}}]}),
+        ([], "token", {"next_page_token": "signed-token"}),
+        ([], "", {}),
+    ],
+)
+def test_generate_runs(
+    chunks: list[list[dict[str, Any]]], page_token: str, expected: dict[str, Any]
+):
+    """Streamed chunks make the SearchRuns JSON response, empty fields omitted."""
+    assert json.loads("".join(_generate(Scan(chunks, page_token)))) == expected
+
+
+def test_generate_runs_error_cuts_the_body():
+    """An error after the first chunk is raised, the body is left unparsable."""
+    generated = []
+    scan = Scan([[{"info": {"run_id": "1"}}]], "token", fail=True)
+    # chunks generated before the error are kept in the list
+    with pytest.raises(MlflowException, match="unavailable"):
+        generated.extend(_generate(scan))
+    assert generated == ['{"runs":[{"info":{"run_id":"1"}}']
+    with pytest.raises(json.JSONDecodeError):
+        json.loads("".join(generated))